@@ -0,0 +1,204 @@
+import asyncio
+import time
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from datastore import DataStore
+
+# Devlog activity analytics. Synced devlogs are kept column by column in typed arrays
+# (one slot per devlog instead of one dict), and aggregates are computed over NumPy
+# views of those arrays. NumPy is imported on first use so it never slows down startup.
+
+DAY = 86400
+# Window name -> days (None for all time)
+STATS_WINDOWS = {"7d": 7, "30d": 30, "90d": 90, "all": None}
+STATS_CACHE_TTL = 300  # Seconds a computed window is reused while no devlogs change
+MAX_DAILY_BARS = 30  # Most recent days shown in the per-day activity chart
+LOAD_CHUNK = 5000  # Devlogs read per query while loading from the store
+PERCENTILES = (50, 90, 99)
+INT64_MIN, INT64_MAX = -(2 ** 63), 2 ** 63 - 1  # Range of the "q" array columns
+
+
+def parse_timestamp(value: Any) -> Optional[int]:
+    # "2025-01-01T12:00:00Z" -> Unix seconds
+    if not isinstance(value, str):
+        return None
+    try:
+        return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+    except ValueError:
+        return None
+
+
+class DevlogColumns:
+    # Column store for devlogs; a devlog seen again overwrites its row in place
+
+    def __init__(self):
+        self.created_at = array("q")
+        self.duration_seconds = array("q")
+        self.likes = array("q")
+        self.comments = array("q")
+        self._rows: Dict[int, int] = {}  # devlog id -> row
+        self.version = 0  # Bumped on every change, so cached results know when they are stale
+
+    def __len__(self) -> int:
+        return len(self.created_at)
+
+    def add(self, records: Iterable[Dict[str, Any]]) -> int:
+        # Insert or update devlogs; returns how many rows were written
+        written = 0
+        for record in records:
+            devlog_id = record.get("id")
+            created_at = parse_timestamp(record.get("created_at"))
+            if devlog_id is None or created_at is None:
+                continue
+            try:
+                # Convert everything before touching a column so the columns stay aligned
+                values = (
+                    created_at,
+                    int(record.get("duration_seconds") or 0),
+                    int(record.get("likes_count") or 0),
+                    int(record.get("comments_count") or 0),
+                )
+            except (TypeError, ValueError, OverflowError):
+                continue
+            if any(not INT64_MIN <= value <= INT64_MAX for value in values):
+                continue
+            row = self._rows.get(devlog_id)
+            if row is None:
+                self._rows[devlog_id] = len(self.created_at)
+                for column, value in zip(self._columns(), values):
+                    column.append(value)
+            else:
+                for column, value in zip(self._columns(), values):
+                    column[row] = value
+            written += 1
+        if written:
+            self.version += 1
+        return written
+
+    def _columns(self) -> Tuple[array, array, array, array]:
+        return self.created_at, self.duration_seconds, self.likes, self.comments
+
+
+class DevlogStats:
+    # Aggregates for one window
+
+    def __init__(
+        self,
+        window: str,
+        count: int,
+        daily: List[Tuple[int, int]],
+        total_duration: int,
+        median_duration: float,
+        likes: Dict[str, float],
+        comments: Dict[str, float],
+    ):
+        self.window = window
+        self.count = count
+        self.daily = daily  # (day start as Unix seconds, devlogs that day), oldest first
+        self.total_duration = total_duration
+        self.median_duration = median_duration
+        self.likes = likes  # "mean", "p50", "p90", "p99", "max"
+        self.comments = comments
+        self.computed_at = time.time()
+        self.version = 0  # DevlogColumns.version the stats were computed from
+
+
+def distribution(np, values) -> Dict[str, float]:
+    if not len(values):
+        return {key: 0.0 for key in ("mean", *(f"p{p}" for p in PERCENTILES), "max")}
+    result = {"mean": float(values.mean())}
+    for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        result[f"p{p}"] = float(value)
+    result["max"] = float(values.max())
+    return result
+
+
+def compute_stats(columns: DevlogColumns, window: str, now: float) -> DevlogStats:
+    # Vectorized aggregates over every devlog created in the window
+    import numpy as np
+
+    created_at = np.frombuffer(columns.created_at, dtype=np.int64)
+    days = STATS_WINDOWS[window]
+    if days is None:
+        mask = slice(None)
+        today = int(now) // DAY
+        first_day = int(created_at.min()) // DAY if len(created_at) else today
+    else:
+        today = int(now) // DAY
+        first_day = today - days + 1
+        mask = created_at >= first_day * DAY
+    created_at = created_at[mask]
+    durations = np.frombuffer(columns.duration_seconds, dtype=np.int64)[mask]
+    likes = np.frombuffer(columns.likes, dtype=np.int64)[mask]
+    comments = np.frombuffer(columns.comments, dtype=np.int64)[mask]
+
+    # Devlogs per day across the window, including empty days
+    day_index = created_at // DAY - first_day
+    day_index = day_index[(day_index >= 0) & (day_index <= today - first_day)]
+    per_day = np.bincount(day_index, minlength=today - first_day + 1)
+    daily = [((first_day + offset) * DAY, int(count)) for offset, count in enumerate(per_day)]
+
+    return DevlogStats(
+        window,
+        count=int(len(created_at)),
+        daily=daily,
+        total_duration=int(durations.sum()),
+        median_duration=float(np.median(durations)) if len(durations) else 0.0,
+        likes=distribution(np, likes),
+        comments=distribution(np, comments),
+    )
+
+
+class DevlogAnalytics:
+    # Columnar devlog store fed by sync, with per-window results cached for STATS_CACHE_TTL
+
+    def __init__(self, store: DataStore):
+        self.store = store
+        self.columns = DevlogColumns()
+        self.loaded = False
+        self._cache: Dict[str, DevlogStats] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, kind: str, records: Iterable[Dict[str, Any]]) -> None:
+        # Sync/index listener
+        if kind == "devlog":
+            self.columns.add(records)
+
+    def stats(self, window: str) -> DevlogStats:
+        cached = self._cache.get(window)
+        now = time.time()
+        version = self.columns.version
+        if cached is not None and cached.version == version and now - cached.computed_at < STATS_CACHE_TTL:
+            return cached
+        stats = self._cache[window] = compute_stats(self.columns, window, now)
+        stats.version = version
+        return stats
+
+    async def load(self) -> int:
+        # Read every stored devlog, yielding to the loop between chunks; returns how many were read
+        loaded = 0
+        last_id = 0
+        while True:
+            records = self.store.records_after("devlog", last_id, LOAD_CHUNK)
+            if not records:
+                break
+            self.columns.add(records)
+            loaded += len(records)
+            last_id = records[-1]["id"]
+            await asyncio.sleep(0)
+        self.loaded = True
+        return loaded
+
+    def start(self):
+        self._task = asyncio.create_task(self.load())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,105 @@
+import os
+from typing import Optional
+
+from aiohttp import web
+from dotenv import load_dotenv
+
+from flavortown_api import (
+    DEFAULT_BURST,
+    DEFAULT_RATE_LIMIT,
+    PRIORITY_HEADER,
+    PRIORITY_INTERACTIVE,
+    FlavorTownAPI,
+    FlavorTownAPIError,
+    request_priority,
+)
+import models
+
+# Local sidecar that owns the Flavortown API client (pool, cache, coalescing and the
+# rate limit budget) on behalf of every bot process on the machine.
+# Run with `python api_gateway.py` and point the bots at it with
+# FLAVORTOWN_GATEWAY_SOCKET or FLAVORTOWN_GATEWAY_URL.
+
+API_KEY = web.AppKey("api", FlavorTownAPI)
+
+
+def parse_priority(value: Optional[str]) -> int:
+    # Priority forwarded by a bot process; unknown values are treated as interactive
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return PRIORITY_INTERACTIVE
+
+
+def error_response(error: FlavorTownAPIError) -> web.Response:
+    # Relay an upstream error with its original status; network failures become 502
+    headers = {}
+    if error.retry_after is not None:
+        headers["Retry-After"] = str(max(1, round(error.retry_after)))
+    return web.json_response({"error": error.detail}, status=error.status or 502, headers=headers)
+
+
+async def handle_api(request: web.Request) -> web.Response:
+    # Proxy /api/v1/<endpoint> through the shared client
+    api = request.app[API_KEY]
+    endpoint = "/" + request.match_info["path"]
+    params = dict(request.query) or None
+    data = dict(await request.post()) if request.can_read_body else None
+    use_cache = "no-cache" not in request.headers.get("Cache-Control", "")
+    try:
+        with request_priority(parse_priority(request.headers.get(PRIORITY_HEADER))):
+            result = await api.proxy_request(request.method, endpoint, params, data, use_cache=use_cache)
+    except FlavorTownAPIError as e:
+        return error_response(e)
+    return web.Response(body=models.dumps_bytes(result), content_type="application/json")
+
+
+async def handle_health(request: web.Request) -> web.Response:
+    api = request.app[API_KEY]
+    return web.json_response({
+        "cache": api.cache.stats(),
+        "inflight": len(api._inflight),
+        "rate_limit_pending": api.rate_limiter.pending,
+        "rate_limit_tokens": api.rate_limiter.tokens,
+    })
+
+
+def create_app(api: FlavorTownAPI) -> web.Application:
+    app = web.Application()
+    app[API_KEY] = api
+    app.router.add_get("/healthz", handle_health)
+    app.router.add_route("*", "/api/v1/{path:.+}", handle_api)
+
+    async def lifecycle(app: web.Application):
+        await api.start()
+        yield
+        await api.close()
+
+    app.cleanup_ctx.append(lifecycle)
+    return app
+
+
+def main():
+    load_dotenv()
+    api_key = os.getenv("FLAVORTOWN_API_KEY")
+    if not api_key:
+        print("Error: FLAVORTOWN_API_KEY not set in environment variables")
+        return
+
+    api = FlavorTownAPI(
+        api_key,
+        rate_limit=float(os.getenv("FLAVORTOWN_RATE_LIMIT", DEFAULT_RATE_LIMIT)),
+        burst=int(os.getenv("FLAVORTOWN_RATE_BURST", DEFAULT_BURST)),
+    )
+    app = create_app(api)
+    socket_path = os.getenv("GATEWAY_SOCKET")
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        web.run_app(app, path=socket_path)
+    else:
+        web.run_app(app, host=os.getenv("GATEWAY_HOST", "127.0.0.1"), port=int(os.getenv("GATEWAY_PORT", "8765")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+import models
+from benchmarks.mock_api import MockData
+
+# Compares the memory held by API payloads kept as parsed JSON dicts with the same
+# payloads as models.py objects, and how long each takes to parse.
+#
+#   python -m benchmarks.memory --records 20000
+
+KINDS = [
+    ("projects", models.Project),
+    ("users", models.User),
+    ("devlogs", models.Devlog),
+    ("store_items", models.StoreItem),
+]
+
+
+def measure(parse: Callable[[], Any]) -> Tuple[Any, int, float]:
+    # (result, bytes still allocated once parsing finished, seconds)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = parse()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # Time separately, tracemalloc slows allocation down
+    started = time.perf_counter()
+    parse()
+    return result, retained, time.perf_counter() - started
+
+
+def compare(name: str, records: List[Dict[str, Any]], model: type) -> None:
+    body = json.dumps(records).encode()
+    as_dicts, dict_bytes, dict_seconds = measure(lambda: models.loads(body))
+    as_models, model_bytes, model_seconds = measure(
+        lambda: [model.from_dict(record) for record in models.loads(body)]
+    )
+    assert [record.to_dict() for record in as_models] == as_dicts
+    count = len(records)
+    print(
+        f"{name:<12} {count:>8} {dict_bytes / count:>10.0f} {model_bytes / count:>10.0f} "
+        f"{1 - model_bytes / dict_bytes:>7.0%} {dict_seconds * 1000:>9.1f} {model_seconds * 1000:>9.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare dict and model memory use for API payloads")
+    parser.add_argument("--records", type=int, default=20000, help="Records per kind")
+    args = parser.parse_args()
+    data = MockData(
+        projects=args.records, users=args.records, devlogs=args.records, store_items=min(args.records, 2000)
+    )
+    print(f"orjson {'enabled' if models.orjson is not None else 'not installed'}")
+    print(f"{'kind':<12} {'records':>8} {'dict B':>10} {'model B':>10} {'saved':>7} {'dict ms':>9} {'model ms':>9}")
+    for name, model in KINDS:
+        compare(name, getattr(data, name), model)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import argparse
+import asyncio
+import random
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+# Local stand-in for https://flavortown.hackclub.com/api/v1 serving synthetic data
+# with configurable latency, error and 429 rates.
+#
+#   python -m benchmarks.mock_api --port 8900 --latency 0.05 --error-rate 0.01
+
+PAGE_SIZE = 20
+ITEM_TYPES = ["Hardware", "Stickers", "Software", "Merch", "Other"]
+SHIP_STATUSES = ["draft", "submitted", "shipped"]
+WORDS = (
+    "arduino bot cookie discord game garden graph keyboard lamp map music neural "
+    "oven pixel plant quiz radio robot rust scanner shader solar synth tracker web"
+).split()
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+class MockData:
+    # Deterministic synthetic projects, users, devlogs and store items
+
+    def __init__(self, projects: int = 500, users: int = 500, devlogs: int = 2000, store_items: int = 40, seed: int = 1):
+        rng = random.Random(seed)
+        created_at = "2025-01-01T12:00:00Z"
+        self.projects = [
+            {
+                "id": i,
+                "title": sentence(rng, 3),
+                "description": sentence(rng, 25),
+                "ship_status": rng.choice(SHIP_STATUSES),
+                "repo_url": f"https://github.com/example/project-{i}",
+                "demo_url": f"https://example.com/{i}" if rng.random() < 0.5 else None,
+                "ai_declaration": "None" if rng.random() < 0.7 else sentence(rng, 8),
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+            for i in range(1, projects + 1)
+        ]
+        self.users = [
+            {
+                "id": i,
+                "display_name": f"{rng.choice(WORDS)}_{i}",
+                "slack_id": f"U{i:08d}",
+                "vote_count": rng.randint(0, 500),
+                "like_count": rng.randint(0, 500),
+                "cookies": rng.randint(0, 5000),
+                "devlog_seconds_today": rng.randint(0, 8 * 3600),
+                "devlog_seconds_total": rng.randint(0, 500 * 3600),
+                "avatar": f"https://example.com/avatars/{i}.png",
+            }
+            for i in range(1, users + 1)
+        ]
+        self.devlogs = [
+            {
+                "id": i,
+                "project_id": rng.randint(1, max(1, projects)),
+                "body": sentence(rng, rng.randint(10, 120)),
+                "comments_count": rng.randint(0, 20),
+                "likes_count": rng.randint(0, 100),
+                "duration_seconds": rng.randint(60, 4 * 3600),
+                "scrapbook_url": None,
+                "created_at": created_at,
+            }
+            for i in range(1, devlogs + 1)
+        ]
+        self.store_items = []
+        for i in range(1, store_items + 1):
+            cost = rng.randint(10, 2000)
+            self.store_items.append({
+                "id": i,
+                "name": f"{sentence(rng, 2)} {i}",
+                "description": sentence(rng, 15),
+                "type": rng.choice(ITEM_TYPES),
+                "stock": rng.randint(0, 100),
+                "limited": rng.random() < 0.2,
+                "image_url": f"https://example.com/store/{i}.png",
+                "ticket_cost": {"base_cost": cost, "us": cost, "eu": cost, "uk": cost, "ca": cost},
+                "enabled": {key: rng.random() < 0.8 for key in ("enabled_us", "enabled_eu", "enabled_uk", "enabled_ca", "enabled_au")},
+            })
+        self.by_id = {
+            "projects": {record["id"]: record for record in self.projects},
+            "users": {record["id"]: record for record in self.users},
+            "devlogs": {record["id"]: record for record in self.devlogs},
+            "store": {record["id"]: record for record in self.store_items},
+        }
+
+
+def paginate(key: str, records: List[Dict[str, Any]], page: int) -> Dict[str, Any]:
+    total_pages = max(1, (len(records) + PAGE_SIZE - 1) // PAGE_SIZE)
+    start = (page - 1) * PAGE_SIZE
+    return {
+        key: records[start:start + PAGE_SIZE],
+        "pagination": {"current_page": page, "total_pages": total_pages, "total_count": len(records)},
+    }
+
+
+class MockFlavortownAPI:
+    # aiohttp app serving MockData under /api/v1
+
+    def __init__(
+        self,
+        data: Optional[MockData] = None,
+        latency: float = 0.05,
+        jitter: float = 0.02,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 0.1,
+        seed: int = 1,
+    ):
+        self.data = data or MockData(seed=seed)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self._runner: Optional[web.AppRunner] = None
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/api/v1/store", self.handle_store)
+        app.router.add_get("/api/v1/{kind:projects|users|devlogs}", self.handle_list)
+        app.router.add_get("/api/v1/{kind:projects|users|devlogs|store}/{id:\\d+}", self.handle_get)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        # Start serving and return the base URL to give FlavorTownAPI
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        return f"http://{host}:{port}/api/v1"
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _simulate(self) -> Optional[web.Response]:
+        # Apply latency, then maybe fail the request
+        self.requests += 1
+        delay = self.latency + self.rng.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        roll = self.rng.random()
+        if roll < self.rate_limit_rate:
+            return web.json_response(
+                {"error": "Rate limit exceeded"}, status=429, headers={"Retry-After": str(self.retry_after)}
+            )
+        if roll < self.rate_limit_rate + self.error_rate:
+            return web.json_response({"error": "Internal server error"}, status=500)
+        return None
+
+    async def handle_list(self, request: web.Request) -> web.Response:
+        failure = await self._simulate()
+        if failure is not None:
+            return failure
+        kind = request.match_info["kind"]
+        records = getattr(self.data, kind)
+        query = request.query.get("query", "").lower()
+        if query:
+            field = "title" if kind == "projects" else "display_name" if kind == "users" else "body"
+            records = [record for record in records if query in record[field].lower()]
+        try:
+            page = max(1, int(request.query.get("page", "1")))
+        except ValueError:
+            page = 1
+        return web.json_response(paginate(kind, records, page))
+
+    async def handle_get(self, request: web.Request) -> web.Response:
+        failure = await self._simulate()
+        if failure is not None:
+            return failure
+        record = self.data.by_id[request.match_info["kind"]].get(int(request.match_info["id"]))
+        if record is None:
+            return web.json_response({"error": "Not found"}, status=404)
+        return web.json_response(record)
+
+    async def handle_store(self, request: web.Request) -> web.Response:
+        failure = await self._simulate()
+        if failure is not None:
+            return failure
+        return web.json_response(self.data.store_items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a mock Flavortown API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    args = parser.parse_args()
+    server = MockFlavortownAPI(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate
+    )
+    web.run_app(server.app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
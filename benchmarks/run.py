@@ -0,0 +1,270 @@
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, List
+
+from benchmarks.mock_api import WORDS, MockData, MockFlavortownAPI
+
+# Drives FlavorTownAPI and the slash command callbacks against the mock API with fake
+# interactions, and reports throughput, latency percentiles and allocations.
+#
+#   python -m benchmarks.run --requests 500 --concurrency 20 --latency 0.05
+
+Operation = Callable[[random.Random], Awaitable[Any]]
+
+_ids = itertools.count(1)
+
+
+class FakeMessage:
+    def __init__(self, channel_id: int):
+        self.id = next(_ids)
+        self.channel = type("Channel", (), {"id": channel_id})()
+
+
+class FakeResponse:
+    # Stands in for discord.InteractionResponse
+    def __init__(self, interaction: "FakeInteraction"):
+        self.interaction = interaction
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def defer(self, **kwargs):
+        self._done = True
+
+    async def send_message(self, content=None, *, embed=None, view=None, ephemeral=False, **kwargs):
+        self._done = True
+        self.interaction.sent.append(embed or content)
+
+    async def edit_message(self, *, content=None, embed=None, view=None, **kwargs):
+        self._done = True
+        self.interaction.sent.append(embed or content)
+
+
+class FakeFollowup:
+    # Stands in for interaction.followup
+    def __init__(self, interaction: "FakeInteraction"):
+        self.interaction = interaction
+
+    async def send(self, content=None, *, embed=None, view=None, ephemeral=False, **kwargs):
+        self.interaction.sent.append(embed or content)
+        return FakeMessage(self.interaction.channel_id)
+
+
+class FakeInteraction:
+    # Just enough of discord.Interaction for the command callbacks
+    def __init__(self):
+        self.id = next(_ids)
+        self.channel_id = 1
+        self.guild = None
+        self.user = type("User", (), {"id": 1})()
+        self.command = None
+        self.extras: Dict[str, Any] = {}
+        self.sent: List[Any] = []
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+
+    async def edit_original_response(self, **kwargs):
+        self.sent.append(kwargs.get("embed") or kwargs.get("content"))
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+    return values[index]
+
+
+async def run_scenario(operation: Operation, requests: int, concurrency: int, seed: int) -> Dict[str, Any]:
+    # Run `requests` operations with `concurrency` workers
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    errors = 0
+    counter = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        while next(counter) < requests:
+            started = time.perf_counter()
+            try:
+                await operation(rng)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "ops": len(latencies),
+        "errors": errors,
+        "seconds": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 0.50),
+        "p90": percentile(latencies, 0.90),
+        "p99": percentile(latencies, 0.99),
+        "max": latencies[-1] if latencies else 0.0,
+    }
+
+
+async def measure_allocations(operation: Operation, requests: int, concurrency: int, seed: int) -> Dict[str, Any]:
+    # Separate pass under tracemalloc (it slows everything down, so timings come from run_scenario)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        await run_scenario(operation, requests, concurrency, seed)
+        _, peak = tracemalloc.get_traced_memory()
+        stats = tracemalloc.take_snapshot().compare_to(before, "filename")
+    finally:
+        tracemalloc.stop()
+    return {
+        "peak_kib": (peak - baseline) / 1024,
+        "retained_per_op": sum(stat.size_diff for stat in stats) / max(1, requests),
+        "blocks_per_op": sum(stat.count_diff for stat in stats) / max(1, requests),
+    }
+
+
+def build_scenarios(main, data: MockData) -> Dict[str, Operation]:
+    # Scenario name -> one operation
+    api = main.api
+    projects, users, devlogs, items = (len(data.projects), len(data.users), len(data.devlogs), len(data.store_items))
+
+    async def command(callback, *args):
+        interaction = FakeInteraction()
+        await callback(interaction, *args)
+        return interaction
+
+    return {
+        "api.get_project": lambda rng: api.get_project(rng.randint(1, projects)),
+        "api.get_project.uncached": lambda rng: api.get_project(rng.randint(1, projects), use_cache=False),
+        "api.get_projects": lambda rng: api.get_projects(page=rng.randint(1, max(1, projects // 20))),
+        "/project": lambda rng: command(main.get_project.callback, rng.randint(1, projects)),
+        "/projects": lambda rng: command(main.search_projects.callback, rng.choice(WORDS)),
+        "/project ids": lambda rng: command(
+            main.get_project.callback, None, ",".join(str(rng.randint(1, projects)) for _ in range(10))
+        ),
+        "/user": lambda rng: command(main.get_user.callback, rng.randint(1, users)),
+        "/users": lambda rng: command(main.search_users.callback, rng.choice(WORDS)),
+        "/devlog": lambda rng: command(main.get_devlog.callback, rng.randint(1, devlogs)),
+        "/devlogs recent": lambda rng: command(main.get_devlogs.callback, rng.randint(1, max(1, devlogs // 20))),
+        "/store": lambda rng: command(main.get_store.callback),
+        "/store_item": lambda rng: command(main.get_store_item.callback, rng.randint(1, items)),
+    }
+
+
+def reset_caches(main):
+    # Start every scenario cold
+    main.api.cache.clear()
+    main.embeds._memo.clear()
+    main.page_cache.clear()
+
+
+def print_row(name: str, result: Dict[str, Any], allocations: Dict[str, Any]):
+    row = (
+        f"{name:<26} {result['ops']:>6} {result['errors']:>6} {result['upstream']:>8} {result['throughput']:>9.1f} "
+        f"{result['p50'] * 1000:>8.1f} {result['p90'] * 1000:>8.1f} {result['p99'] * 1000:>8.1f} {result['max'] * 1000:>8.1f}"
+    )
+    if allocations:
+        row += (
+            f" {allocations['peak_kib']:>9.1f} {allocations['retained_per_op']:>9.0f} {allocations['blocks_per_op']:>8.1f}"
+        )
+    print(row)
+
+
+async def run(args):
+    data = MockData(projects=args.projects, users=args.users, devlogs=args.devlogs, store_items=args.store_items)
+    server = MockFlavortownAPI(
+        data,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+    )
+    url = await server.start()
+    workdir = tempfile.mkdtemp(prefix="flavortown-bench-")
+
+    # main reads its configuration at import time
+    os.environ.update({
+        "FLAVORTOWN_API_KEY": "benchmark",
+        "FLAVORTOWN_API_URL": url,
+        "FLAVORTOWN_RATE_LIMIT": str(args.rate_limit),
+        "FLAVORTOWN_RATE_BURST": str(max(1, int(args.rate_limit))),
+        "SYNC_ENABLED": "0",
+        "DIAGNOSTICS": "0",
+        "METRICS_PORT": "0",
+        "DATA_DB": os.path.join(workdir, "flavortown.db"),
+        "SEARCH_INDEX_DB": os.path.join(workdir, "search.db"),
+        "AUTO_DELETE_DB": os.path.join(workdir, "autodelete.db"),
+        "SNAPSHOT_FILE": os.path.join(workdir, "snapshot.json"),
+    })
+    for name in ("FLAVORTOWN_GATEWAY_URL", "FLAVORTOWN_GATEWAY_SOCKET", "SHARD_COUNT", "SHARD_IDS", "SHARDED"):
+        os.environ.pop(name, None)
+    import main
+
+    # There is no Discord connection, so the auto-delete worker must never wake up
+    main.bot.wait_until_ready = asyncio.Event().wait
+    await main.bot.setup_hook()
+    try:
+        scenarios = build_scenarios(main, data)
+        selected = args.scenarios or list(scenarios)
+        unknown = [name for name in selected if name not in scenarios]
+        if unknown:
+            raise SystemExit(f"Unknown scenarios: {', '.join(unknown)} (choose from {', '.join(scenarios)})")
+
+        print(
+            f"mock latency {args.latency * 1000:.0f}ms, error rate {args.error_rate:.0%}, "
+            f"429 rate {args.rate_limit_rate:.0%}, {args.requests} requests x {args.concurrency} workers"
+        )
+        header = f"{'scenario':<26} {'ops':>6} {'errors':>6} {'upstream':>8} {'ops/s':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+        if args.allocations:
+            header += f" {'peak KiB':>9} {'B/op':>9} {'blk/op':>8}"
+        print(header)
+        for name in selected:
+            reset_caches(main)
+            upstream_before = server.requests
+            result = await run_scenario(scenarios[name], args.requests, args.concurrency, args.seed)
+            result["upstream"] = server.requests - upstream_before
+            allocations = {}
+            if args.allocations:
+                reset_caches(main)
+                allocations = await measure_allocations(
+                    scenarios[name], min(args.requests, args.allocation_requests), args.concurrency, args.seed
+                )
+            print_row(name, result, allocations)
+    finally:
+        await main.FlavorTownBot.close(main.bot)
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the bot against a mock Flavortown API")
+    parser.add_argument("scenarios", nargs="*", help="Scenarios to run (default: all)")
+    parser.add_argument("--requests", type=int, default=500, help="Operations per scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock API latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of mock responses that are 429s")
+    parser.add_argument("--rate-limit", type=float, default=1000.0, help="Client-side requests per second")
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--devlogs", type=int, default=2000)
+    parser.add_argument("--store-items", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-allocations", dest="allocations", action="store_false", help="Skip the tracemalloc pass")
+    parser.add_argument("--allocation-requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
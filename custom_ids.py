@@ -0,0 +1,22 @@
+from typing import List, Optional
+
+# Button state lives in the button's custom_id ("ft:<action>:<args...>") instead of in a View
+# object, so buttons cost no memory after sending and keep working across restarts
+
+PREFIX = "ft"
+MAX_LENGTH = 100  # Discord's custom_id limit
+
+
+def make(*parts) -> str:
+    # make("project", 12, "details") -> "ft:project:12:details"
+    custom_id = ":".join([PREFIX, *(str(part) for part in parts)])
+    if len(custom_id) > MAX_LENGTH:
+        raise ValueError(f"custom_id too long: {custom_id}")
+    return custom_id
+
+
+def parse(custom_id: Optional[str]) -> Optional[List[str]]:
+    # "ft:project:12:details" -> ["project", "12", "details"]; None for IDs that are not ours
+    if not custom_id or not custom_id.startswith(PREFIX + ":"):
+        return None
+    return custom_id.split(":")[1:]
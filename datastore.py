@@ -0,0 +1,140 @@
+import hashlib
+import json
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import models
+
+QUERY_RETENTION = 30 * 24 * 3600  # Seconds a saved search query is kept after its last use
+
+
+class DataStore:
+    # Local copy of the Flavortown dataset kept warm by the sync engine
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+
+    def open(self):
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS records (
+                kind TEXT NOT NULL,
+                id INTEGER NOT NULL,
+                created_at TEXT,
+                synced_at REAL NOT NULL,
+                payload TEXT NOT NULL,
+                PRIMARY KEY (kind, id)
+            );
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                kind TEXT PRIMARY KEY,
+                next_page INTEGER NOT NULL DEFAULT 1,
+                max_id INTEGER NOT NULL DEFAULT 0,
+                full_complete_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS queries (
+                key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                used_at REAL NOT NULL
+            );
+            """
+        )
+        self._db.execute("DELETE FROM queries WHERE used_at < ?", (time.time() - QUERY_RETENTION,))
+        self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def upsert(self, kind: str, records: Iterable[Dict[str, Any]]) -> int:
+        # Insert or replace records of one kind; returns how many were written
+        now = time.time()
+        rows = [
+            (kind, record["id"], record.get("created_at"), now, models.dumps(record))
+            for record in records
+            if record.get("id") is not None
+        ]
+        self._db.executemany(
+            "INSERT OR REPLACE INTO records (kind, id, created_at, synced_at, payload) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        self._db.commit()
+        return len(rows)
+
+    def replace_all(self, kind: str, records: Iterable[Dict[str, Any]]) -> int:
+        # Replace every record of a kind (for endpoints that return the whole set at once)
+        self._db.execute("DELETE FROM records WHERE kind = ?", (kind,))
+        return self.upsert(kind, records)
+
+    def get(self, kind: str, record_id: int) -> Optional[Dict[str, Any]]:
+        row = self._db.execute(
+            "SELECT payload FROM records WHERE kind = ? AND id = ?", (kind, record_id)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_records(self, kind: str) -> Iterator[Dict[str, Any]]:
+        # Stream every stored record of a kind in id order
+        cursor = self._db.execute("SELECT payload FROM records WHERE kind = ? ORDER BY id", (kind,))
+        for (payload,) in cursor:
+            yield json.loads(payload)
+
+    def records_after(self, kind: str, after_id: int, limit: int) -> List[Dict[str, Any]]:
+        # One chunk of records in id order, for scans that yield to the event loop between chunks
+        rows = self._db.execute(
+            "SELECT payload FROM records WHERE kind = ? AND id > ? ORDER BY id LIMIT ?", (kind, after_id, limit)
+        ).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def count(self, kind: str) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM records WHERE kind = ?", (kind,)).fetchone()[0]
+
+    def max_id(self, kind: str) -> int:
+        row = self._db.execute("SELECT MAX(id) FROM records WHERE kind = ?", (kind,)).fetchone()
+        return row[0] or 0
+
+    def save_query(self, query: str) -> str:
+        # Remember a search query under a short key that fits in a button custom_id
+        key = hashlib.sha1(query.encode()).hexdigest()[:12]
+        self._db.execute(
+            "INSERT OR REPLACE INTO queries (key, query, used_at) VALUES (?, ?, ?)", (key, query, time.time())
+        )
+        self._db.commit()
+        return key
+
+    def get_query(self, key: str) -> Optional[str]:
+        row = self._db.execute("SELECT query FROM queries WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+        self._db.commit()
+
+    def get_checkpoint(self, kind: str) -> Dict[str, Any]:
+        row = self._db.execute(
+            "SELECT next_page, max_id, full_complete_at FROM checkpoints WHERE kind = ?", (kind,)
+        ).fetchone()
+        if row is None:
+            return {"next_page": 1, "max_id": 0, "full_complete_at": None}
+        return {"next_page": row[0], "max_id": row[1], "full_complete_at": row[2]}
+
+    def set_checkpoint(self, kind: str, **values):
+        checkpoint = self.get_checkpoint(kind)
+        checkpoint.update(values)
+        self._db.execute(
+            "INSERT OR REPLACE INTO checkpoints (kind, next_page, max_id, full_complete_at) VALUES (?, ?, ?, ?)",
+            (kind, checkpoint["next_page"], checkpoint["max_id"], checkpoint["full_complete_at"]),
+        )
+        self._db.commit()
@@ -0,0 +1,142 @@
+import asyncio
+import heapq
+import sqlite3
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import discord
+
+BULK_DELETE_LIMIT = 100  # Messages per bulk delete request
+BULK_DELETE_MAX_AGE = 14 * 24 * 3600 - 600  # Discord refuses to bulk delete older messages
+MAX_BATCH = 500  # Deletions handled per wakeup
+
+
+class DeleteScheduler:
+    # Restart-safe auto-delete queue: one min-heap and one task instead of a sleeping task per message
+
+    def __init__(self, bot: discord.Client, path: str):
+        self.bot = bot
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+        self._heap: List[Tuple[float, int, int]] = []  # (delete_at, channel_id, message_id)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def depth(self) -> int:
+        # Messages waiting to be deleted
+        return len(self._heap)
+
+    async def start(self):
+        # Open the store, restore pending deletions and start the worker
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS scheduled_deletes ("
+            "message_id INTEGER PRIMARY KEY, channel_id INTEGER NOT NULL, delete_at REAL NOT NULL)"
+        )
+        self._db.commit()
+        rows = self._db.execute("SELECT delete_at, channel_id, message_id FROM scheduled_deletes").fetchall()
+        self._heap = [tuple(row) for row in rows]
+        heapq.heapify(self._heap)
+        if self._heap:
+            print(f"Restored {len(self._heap)} pending auto-delete(s)")
+
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        # Stop the worker; pending deletions stay on disk for the next start
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def schedule(self, channel_id: int, message_id: int, delay: float):
+        # Queue a message for deletion after `delay` seconds
+        delete_at = time.time() + delay
+        self._db.execute(
+            "INSERT OR REPLACE INTO scheduled_deletes (message_id, channel_id, delete_at) VALUES (?, ?, ?)",
+            (message_id, channel_id, delete_at),
+        )
+        self._db.commit()
+        heapq.heappush(self._heap, (delete_at, channel_id, message_id))
+        if self._heap[0][2] == message_id:
+            # New earliest deadline, re-arm the worker
+            self._wakeup.set()
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            due: Dict[int, List[int]] = defaultdict(list)
+            now = time.time()
+            count = 0
+            while self._heap and self._heap[0][0] <= now and count < MAX_BATCH:
+                _, channel_id, message_id = heapq.heappop(self._heap)
+                due[channel_id].append(message_id)
+                count += 1
+
+            for channel_id, message_ids in due.items():
+                try:
+                    await self._delete_batch(channel_id, message_ids)
+                except Exception as e:
+                    print(f"Error deleting messages in channel {channel_id}: {e}")
+
+            self._db.executemany(
+                "DELETE FROM scheduled_deletes WHERE message_id = ?",
+                [(message_id,) for ids in due.values() for message_id in ids],
+            )
+            self._db.commit()
+
+    async def _delete_batch(self, channel_id: int, message_ids: List[int]):
+        # Bulk delete where the channel allows it, otherwise delete one by one
+        channel = self.bot.get_channel(channel_id)
+        remaining = message_ids
+        if hasattr(channel, "delete_messages"):
+            cutoff = time.time() - BULK_DELETE_MAX_AGE
+            recent = [m for m in message_ids if discord.utils.snowflake_time(m).timestamp() > cutoff]
+            remaining = [m for m in message_ids if discord.utils.snowflake_time(m).timestamp() <= cutoff]
+            for i in range(0, len(recent), BULK_DELETE_LIMIT):
+                chunk = recent[i:i + BULK_DELETE_LIMIT]
+                if len(chunk) < 2:
+                    remaining.extend(chunk)
+                    continue
+                try:
+                    await channel.delete_messages([discord.Object(id=m) for m in chunk])
+                except discord.HTTPException:
+                    # Usually missing Manage Messages; the bot can still delete its own messages
+                    remaining.extend(chunk)
+
+        partial = self.bot.get_partial_messageable(channel_id)
+        for message_id in remaining:
+            try:
+                await partial.get_partial_message(message_id).delete()
+            except discord.NotFound:
+                # Message was already deleted
+                pass
+            except discord.Forbidden:
+                # Bot doesn't have permission to delete the message
+                pass
+            except discord.HTTPException as e:
+                print(f"Error deleting message: {e}")
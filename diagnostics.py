@@ -0,0 +1,206 @@
+import asyncio
+import json
+import logging
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+# Opt-in event loop diagnostics (DIAGNOSTICS=1): slow callback warnings, stack samples
+# of the loop thread while it is blocked, and per-interaction spans. Everything is written
+# as JSON lines to a rotating file for offline analysis.
+
+DEFAULT_FILE = "diagnostics.log"
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUPS = 5
+DEFAULT_SLOW_CALLBACK = 0.1  # Seconds a single callback may run before it is reported
+DEFAULT_STALL = 0.5  # Seconds the loop may go without a heartbeat before its stack is sampled
+HEARTBEAT_INTERVAL = 0.05
+MAX_STACK_SAMPLES = 5  # Samples taken per stall
+
+logger = logging.getLogger("flavortown.diagnostics")
+logger.propagate = False
+
+# The trace of the interaction currently being handled, if it is being traced
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("flavortown_trace", default=None)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    # One JSON object per line; structured events carry their fields in record.event
+    def format(self, record: logging.LogRecord) -> str:
+        event = getattr(record, "event", None)
+        if event is None:
+            event = {"kind": "log", "logger": record.name, "level": record.levelname, "message": record.getMessage()}
+        return json.dumps({"time": record.created, **event}, default=str)
+
+
+class Trace:
+    # Spans recorded while handling one interaction
+
+    def __init__(self, name: str, interaction_id: int):
+        self.name = name
+        self.interaction_id = interaction_id
+        self.started = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+
+    def add(self, name: str, start: float, duration: float, **attributes):
+        self.spans.append({
+            "name": name,
+            "start": round(start - self.started, 6),
+            "duration": round(duration, 6),
+            **attributes,
+        })
+
+    def finish(self, outcome: str):
+        logger.info("trace", extra={"event": {
+            "kind": "trace",
+            "name": self.name,
+            "interaction_id": self.interaction_id,
+            "outcome": outcome,
+            "duration": round(time.perf_counter() - self.started, 6),
+            "spans": self.spans,
+        }})
+
+
+def start_trace(interaction) -> None:
+    # Begin tracing a slash command; spans recorded in its task attach to this trace
+    if not enabled or interaction.command is None:
+        return
+    trace = Trace(interaction.command.qualified_name, interaction.id)
+    interaction.extras["trace"] = trace
+    _current_trace.set(trace)
+
+
+def finish_trace(interaction, outcome: str) -> None:
+    trace = interaction.extras.pop("trace", None)
+    if trace is not None:
+        trace.finish(outcome)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    # Time a block as part of the current trace; a no-op when nothing is being traced
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, start, time.perf_counter() - start, **attributes)
+
+
+def record_span(name: str, duration: float, **attributes) -> None:
+    # Add a span that just finished and was timed elsewhere
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(name, time.perf_counter() - duration, duration, **attributes)
+
+
+def observe_api_request(method: str, endpoint: str, status: int, seconds: float) -> None:
+    # FlavorTownAPI request listener: each upstream attempt becomes an "api" span
+    record_span("api", seconds, method=method, endpoint=endpoint, status=status)
+
+
+async def defer(interaction, **kwargs) -> None:
+    # interaction.response.defer(), recorded as the "defer" span
+    with span("defer"):
+        await interaction.response.defer(**kwargs)
+
+
+class StallWatchdog(threading.Thread):
+    # Samples the loop thread's stack whenever the loop stops answering heartbeats
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, stall_threshold: float):
+        super().__init__(name="flavortown-stall-watchdog", daemon=True)
+        self.loop = loop
+        self.stall_threshold = stall_threshold
+        self.loop_thread_id = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self._stopped = threading.Event()
+        self._handle: Optional[asyncio.TimerHandle] = None
+
+    def start(self):
+        # Must be called from the loop thread
+        self._beat()
+        super().start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._handle is not None:
+            self._handle.cancel()
+
+    def _beat(self):
+        self.last_beat = time.monotonic()
+        if not self._stopped.is_set():
+            self._handle = self.loop.call_later(HEARTBEAT_INTERVAL, self._beat)
+
+    def run(self):
+        while not self._stopped.wait(self.stall_threshold / 2):
+            stalled_for = time.monotonic() - self.last_beat
+            if stalled_for < self.stall_threshold:
+                continue
+            beat = self.last_beat
+            samples = []
+            # Sample until the loop recovers so the log shows where the time went
+            while self.last_beat == beat and len(samples) < MAX_STACK_SAMPLES and not self._stopped.is_set():
+                frame = sys._current_frames().get(self.loop_thread_id)
+                if frame is None:
+                    break
+                samples.append(traceback.format_stack(frame))
+                self._stopped.wait(self.stall_threshold / 2)
+            logger.warning("stall", extra={"event": {
+                "kind": "stall",
+                "stalled_for": round(time.monotonic() - beat, 6),
+                "samples": samples,
+            }})
+
+
+enabled = False
+_watchdog: Optional[StallWatchdog] = None
+
+
+def enable(
+    path: str = DEFAULT_FILE,
+    slow_callback: float = DEFAULT_SLOW_CALLBACK,
+    stall_threshold: float = DEFAULT_STALL,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    backups: int = DEFAULT_BACKUPS,
+) -> None:
+    # Turn diagnostics on for the running loop (called from the bot's setup hook)
+    global enabled, _watchdog
+    from logging.handlers import RotatingFileHandler
+
+    handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups)
+    handler.setFormatter(JsonLinesFormatter())
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+    # asyncio reports "Executing <Handle ...> took 0.25 seconds" in debug mode
+    asyncio_logger = logging.getLogger("asyncio")
+    asyncio_logger.addHandler(handler)
+    asyncio_logger.setLevel(logging.WARNING)
+    loop = asyncio.get_running_loop()
+    loop.set_debug(True)
+    loop.slow_callback_duration = slow_callback
+
+    _watchdog = StallWatchdog(loop, stall_threshold)
+    _watchdog.start()
+    enabled = True
+    print(f"Diagnostics enabled, writing to {path}")
+
+
+def disable() -> None:
+    global enabled, _watchdog
+    if _watchdog is not None:
+        _watchdog.stop()
+        _watchdog = None
+    enabled = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        logging.getLogger("asyncio").removeHandler(handler)
+        handler.close()
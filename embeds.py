@@ -0,0 +1,360 @@
+import hashlib
+from datetime import datetime, timezone
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Dict, Optional
+
+import discord
+
+import models
+from diagnostics import span
+
+MAX_MEMOIZED_EMBEDS = 1024
+MAX_MESSAGE_EMBEDS = 10  # Discord's limit on embeds per message
+MAX_MESSAGE_EMBED_CHARS = 6000  # Discord's limit on the combined size of a message's embeds
+
+# (view kind, entity id, entity version) -> prebuilt embed
+_memo: "OrderedDict[tuple, discord.Embed]" = OrderedDict()
+memo_hits = 0
+memo_misses = 0
+
+
+def entity_version(record: Dict[str, Any]) -> str:
+    # Cheap version marker for an entity: updated_at when the API sends it, else a content hash
+    updated_at = record.get("updated_at")
+    if updated_at:
+        return str(updated_at)
+    return hashlib.sha1(models.dumps(record, sort_keys=True).encode()).hexdigest()
+
+
+def memoized(view_kind: str):
+    # Reuse the embed built for the same entity version and view kind.
+    # Memoized embeds are shared between messages and must not be modified by callers.
+    def decorator(builder):
+        @wraps(builder)
+        def wrapper(record):
+            global memo_hits, memo_misses
+            key = (view_kind, record.get("id"), entity_version(record))
+            embed = _memo.get(key)
+            if embed is not None:
+                _memo.move_to_end(key)
+                memo_hits += 1
+                return embed
+            memo_misses += 1
+            with span("render", view=view_kind):
+                embed = builder(record)
+            _memo[key] = embed
+            if len(_memo) > MAX_MEMOIZED_EMBEDS:
+                _memo.popitem(last=False)
+            return embed
+        return wrapper
+    return decorator
+
+
+def batch_embeds(embed_list):
+    # Split embeds into groups that each fit in one message
+    batch, size = [], 0
+    for embed in embed_list:
+        if batch and (size + len(embed) > MAX_MESSAGE_EMBED_CHARS or len(batch) == MAX_MESSAGE_EMBEDS):
+            yield batch
+            batch, size = [], 0
+        batch.append(embed)
+        size += len(embed)
+    if batch:
+        yield batch
+
+
+def format_price_with_hours(biscuits):
+    """Format price showing both biscuits and equivalent hours (1h = 10 biscuits)"""
+    if biscuits is None or biscuits == 'N/A':
+        return 'N/A'
+
+    hours = biscuits / 10
+    if hours == int(hours):
+        # Whole number of hours
+        return f"{biscuits} biscuits ({int(hours)}h)"
+    else:
+        # Decimal hours, show with 1 decimal place
+        return f"{biscuits} biscuits ({hours:.1f}h)"
+
+
+# Projects
+
+@memoized("project")
+def project_embed(project):
+    embed = discord.Embed(title=project["title"], description=project["description"], color=discord.Color.blue())
+    embed.add_field(name="ID", value=str(project["id"]), inline=True)
+    embed.add_field(name="Status", value=project.get("ship_status", "N/A"), inline=True)
+    if project.get("repo_url"):
+        embed.add_field(name="Repository", value=f"[Link]({project['repo_url']})", inline=False)
+    if project.get("demo_url"):
+        embed.add_field(name="Demo", value=f"[Link]({project['demo_url']})", inline=False)
+    embed.set_footer(text=f"Created: {project['created_at']}")
+    return embed
+
+
+@memoized("project_details")
+def project_details_embed(project):
+    embed = discord.Embed(title=project["title"], description=project["description"], color=discord.Color.blue())
+    embed.add_field(name="ID", value=str(project["id"]), inline=True)
+    embed.add_field(name="Status", value=project.get("ship_status", "N/A"), inline=True)
+    embed.add_field(name="Created", value=project["created_at"][:10], inline=True)
+    if project.get("ai_declaration"):
+        embed.add_field(name="AI Declaration", value=project["ai_declaration"], inline=False)
+    return embed
+
+
+def projects_page_embed(result) -> Optional[discord.Embed]:
+    # One page of project search results, or None if the page is empty
+    projects = result.get("projects", [])
+    pagination = result.get("pagination", {})
+    if not projects:
+        return None
+
+    embed = discord.Embed(
+        title=f"Projects Search Results",
+        description=f"Found {pagination.get('total_count', 0)} projects",
+        color=discord.Color.green(),
+    )
+
+    for project in projects[:5]:  # Show first 5 results
+        embed.add_field(
+            name=project["title"],
+            value=f"{project['description'][:100]}...",
+            inline=False,
+        )
+
+    embed.set_footer(
+        text=f"Page {pagination.get('current_page', 1)} of {pagination.get('total_pages', 1)}"
+    )
+    return embed
+
+
+# Devlogs
+
+@memoized("devlog")
+def devlog_embed(devlog):
+    embed = discord.Embed(
+        title=f"Devlog #{devlog['id']}",
+        description=devlog["body"][:300] + "..." if len(devlog["body"]) > 300 else devlog["body"],
+        color=discord.Color.purple(),
+    )
+    embed.add_field(name="Comments", value=str(devlog.get("comments_count", 0)), inline=True)
+    embed.add_field(name="Likes", value=str(devlog.get("likes_count", 0)), inline=True)
+    embed.add_field(
+        name="Duration", value=f"{devlog.get('duration_seconds', 0)}s", inline=True
+    )
+    if devlog.get("scrapbook_url"):
+        embed.add_field(name="Scrapbook", value=f"[Link]({devlog['scrapbook_url']})", inline=False)
+    embed.set_footer(text=f"Created: {devlog['created_at']}")
+    return embed
+
+
+def devlogs_page_embed(result, title: str) -> Optional[discord.Embed]:
+    # One page of devlogs, or None if the page is empty
+    devlogs = result.get("devlogs", [])
+    pagination = result.get("pagination", {})
+    if not devlogs:
+        return None
+
+    embed = discord.Embed(
+        title=title,
+        description=f"Total: {pagination.get('total_count', 0)}",
+        color=discord.Color.green(),
+    )
+
+    for devlog in devlogs[:5]:  # Show first 5
+        embed.add_field(
+            name=f"Devlog #{devlog['id']}",
+            value=f"{devlog['body'][:80]}... | 💬 {devlog.get('comments_count', 0)} | ❤️ {devlog.get('likes_count', 0)}",
+            inline=False,
+        )
+
+    embed.set_footer(
+        text=f"Page {pagination.get('current_page', 1)} of {pagination.get('total_pages', 1)}"
+    )
+    return embed
+
+
+# Users
+
+@memoized("user")
+def user_embed(user):
+    embed = discord.Embed(title=user["display_name"], color=discord.Color.orange())
+    embed.add_field(name="ID", value=str(user["id"]), inline=True)
+    if user.get("slack_id"):
+        embed.add_field(name="Slack ID", value=user["slack_id"], inline=True)
+    embed.add_field(name="Votes", value=str(user.get("vote_count", 0)), inline=True)
+    embed.add_field(name="Likes", value=str(user.get("like_count", 0)), inline=True)
+    embed.add_field(
+        name="Devlog Time (Today)", value=f"{user.get('devlog_seconds_today', 0)}s", inline=True
+    )
+    embed.add_field(
+        name="Devlog Time (Total)", value=f"{user.get('devlog_seconds_total', 0)}s", inline=True
+    )
+    if user.get("avatar"):
+        embed.set_thumbnail(url=user["avatar"])
+    return embed
+
+
+@memoized("user_stats")
+def user_stats_embed(user):
+    embed = discord.Embed(title=f"{user['display_name']}'s Stats", color=discord.Color.orange())
+    embed.add_field(name="Votes", value=str(user.get("vote_count", 0)), inline=True)
+    embed.add_field(name="Likes", value=str(user.get("like_count", 0)), inline=True)
+    embed.add_field(name="Cookies", value=str(user.get("cookies", 0)), inline=True)
+    embed.add_field(name="Devlog Time (Today)", value=f"{user.get('devlog_seconds_today', 0)}s", inline=True)
+    embed.add_field(name="Devlog Time (Total)", value=f"{user.get('devlog_seconds_total', 0)}s", inline=True)
+    return embed
+
+
+def users_page_embed(result) -> Optional[discord.Embed]:
+    # One page of user search results, or None if the page is empty
+    users = result.get("users", [])
+    pagination = result.get("pagination", {})
+    if not users:
+        return None
+
+    embed = discord.Embed(
+        title=f"User Search Results",
+        description=f"Found {pagination.get('total_count', 0)} users",
+        color=discord.Color.yellow(),
+    )
+
+    for user in users[:5]:  # Show first 5 results
+        embed.add_field(
+            name=user["display_name"],
+            value=f"Slack: {user.get('slack_id', 'N/A')} | Cookies: {user.get('cookies', 0)}",
+            inline=False,
+        )
+
+    embed.set_footer(
+        text=f"Page {pagination.get('current_page', 1)} of {pagination.get('total_pages', 1)}"
+    )
+    return embed
+
+
+# Leaderboards
+
+def leaderboard_embed(title: str, metric: str, rows, recomputed_at: Optional[float]):
+    # rows are (user id, display name, score), best first
+    lines = []
+    for rank, (user_id, name, score) in enumerate(rows, start=1):
+        value = f"{score / 3600:.1f}h" if metric == "devlog_seconds_total" else f"{score:,.0f}"
+        lines.append(f"**{rank}.** {name} - {value}")
+    embed = discord.Embed(title=f"🏆 {title} Leaderboard", description="\n".join(lines), color=discord.Color.gold())
+    if recomputed_at is not None:
+        embed.set_footer(text="Fully recomputed")
+        embed.timestamp = datetime.fromtimestamp(recomputed_at, tz=timezone.utc)
+    return embed
+
+
+def format_duration(seconds) -> str:
+    hours, minutes = divmod(int(seconds) // 60, 60)
+    return f"{hours}h {minutes}m" if hours else f"{minutes}m"
+
+
+def devlog_stats_embed(title: str, stats, max_days: int):
+    # stats is an analytics.DevlogStats; the chart shows the last max_days days
+    embed = discord.Embed(title=f"📊 Devlog Activity - {title}", color=discord.Color.purple())
+    embed.add_field(name="Devlogs", value=f"{stats.count:,}", inline=True)
+    embed.add_field(name="Total Time", value=format_duration(stats.total_duration), inline=True)
+    embed.add_field(name="Median Duration", value=format_duration(stats.median_duration), inline=True)
+    for name, values in (("Likes", stats.likes), ("Comments", stats.comments)):
+        embed.add_field(
+            name=name,
+            value=(
+                f"avg {values['mean']:.1f} | median {values['p50']:.0f} | "
+                f"p90 {values['p90']:.0f} | p99 {values['p99']:.0f} | max {values['max']:.0f}"
+            ),
+            inline=False,
+        )
+
+    days = stats.daily[-max_days:]
+    peak = max((count for _, count in days), default=0)
+    if peak:
+        lines = [
+            f"{datetime.fromtimestamp(day, tz=timezone.utc):%m-%d} {'█' * round(count * 15 / peak):<15} {count}"
+            for day, count in days
+        ]
+        embed.add_field(name="Devlogs per Day", value="```\n" + "\n".join(lines) + "\n```", inline=False)
+    embed.set_footer(text="Computed from synced devlogs")
+    embed.timestamp = datetime.fromtimestamp(stats.computed_at, tz=timezone.utc)
+    return embed
+
+
+# Store
+
+@memoized("store_item")
+def store_item_embed(item):
+    embed = discord.Embed(title=item["name"], description=item.get("description", ""), color=discord.Color.blurple())
+    embed.add_field(name="Type", value=item.get("type", "N/A"), inline=True)
+    embed.add_field(name="Stock", value=str(item.get("stock", 0)), inline=True)
+    embed.add_field(name="Limited", value="Yes" if item.get("limited") else "No", inline=True)
+
+    if item.get("image_url"):
+        embed.set_image(url=item["image_url"])
+
+    embed.set_footer(text=f"Item ID: {item['id']}")
+    return embed
+
+
+@memoized("store_item_price")
+def store_item_price_embed(item):
+    ticket_cost = item.get("ticket_cost", {})
+    base_cost = ticket_cost.get('base_cost')
+
+    embed = discord.Embed(title=f"🍪 {item['name']} - Pricing", color=discord.Color.gold())
+
+    # Check if all country prices are the same as base cost
+    country_prices = [ticket_cost.get('us'), ticket_cost.get('eu'), ticket_cost.get('uk'), ticket_cost.get('ca')]
+    all_same = all(price == base_cost for price in country_prices if price is not None)
+
+    if all_same and base_cost is not None:
+        # All prices are the same, just show base cost
+        embed.add_field(name="Price", value=format_price_with_hours(base_cost), inline=False)
+    else:
+        # Show individual country prices
+        embed.add_field(name="Base Cost", value=format_price_with_hours(base_cost), inline=True)
+        embed.add_field(name="US Price", value=format_price_with_hours(ticket_cost.get('us')), inline=True)
+        embed.add_field(name="EU Price", value=format_price_with_hours(ticket_cost.get('eu')), inline=True)
+        embed.add_field(name="UK Price", value=format_price_with_hours(ticket_cost.get('uk')), inline=True)
+        embed.add_field(name="CA Price", value=format_price_with_hours(ticket_cost.get('ca')), inline=True)
+    return embed
+
+
+@memoized("store_item_availability")
+def store_item_availability_embed(item):
+    enabled = item.get("enabled", {})
+    embed = discord.Embed(title=f"📦 {item['name']} - Availability", color=discord.Color.green())
+    embed.add_field(name="🇺🇸 United States", value="✅" if enabled.get("enabled_us") else "❌", inline=True)
+    embed.add_field(name="🇪🇺 Europe", value="✅" if enabled.get("enabled_eu") else "❌", inline=True)
+    embed.add_field(name="🇬🇧 UK", value="✅" if enabled.get("enabled_uk") else "❌", inline=True)
+    embed.add_field(name="🇨🇦 Canada", value="✅" if enabled.get("enabled_ca") else "❌", inline=True)
+    embed.add_field(name="🇦🇺 Australia", value="✅" if enabled.get("enabled_au") else "❌", inline=True)
+    return embed
+
+
+def store_page_embed(item_type: str, type_items, item_page: int, category: int, categories: int, items_per_page: int):
+    # One page of one store category
+    start_idx = item_page * items_per_page
+    page_items = type_items[start_idx:start_idx + items_per_page]
+    total_item_pages = (len(type_items) - 1) // items_per_page + 1
+
+    embed = discord.Embed(
+        title=f"🛍️ Store Items - {item_type.title()}",
+        color=discord.Color.gold(),
+        description=f"Found {len(type_items)} {item_type.lower()} item{'s' if len(type_items) != 1 else ''}"
+    )
+
+    for item in page_items:
+        stock = item.get("stock", "Unknown")
+        limited = "🔴 Limited" if item.get("limited") else "🟢 Available"
+        embed.add_field(
+            name=f"{item['name']} (ID: {item['id']})",
+            value=f"{limited} | Stock: {stock}",
+            inline=False,
+        )
+
+    embed.set_footer(text=f"Category {category + 1} of {categories} | Items {item_page + 1} of {total_item_pages}")
+    return embed
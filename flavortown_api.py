@@ -1,35 +1,683 @@
 import aiohttp
 import asyncio
-from typing import Optional, Dict, Any, List
+import heapq
+import itertools
+import json
+import random
+import re
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, AsyncIterator, Awaitable, Callable, Deque, Iterable, List, Tuple, Union
+
+import models
 
 BASE_URL = "https://flavortown.hackclub.com/api/v1"
 
+# Connection pool settings for the shared session
+POOL_LIMIT = 100  # Total simultaneous connections
+POOL_LIMIT_PER_HOST = 20  # Simultaneous connections to the API host
+KEEPALIVE_TIMEOUT = 60  # Seconds an idle connection is kept open
+DNS_CACHE_TTL = 300  # Seconds a resolved address is reused
+REQUEST_TIMEOUT = 15  # Total seconds allowed for a single request
+
+# Seconds each cached read endpoint stays fresh
+CACHE_TTLS = {
+    "store": 600,
+    "store_item": 600,
+    "project": 120,
+    "user": 30,
+    "devlog": 30,
+}
+CACHE_MAX_ENTRIES = 2048
+CACHE_MAX_BYTES = 16 * 1024 * 1024  # Based on response body sizes
+
+# Client-side rate limiting (tune to the upstream quota)
+DEFAULT_RATE_LIMIT = 5.0  # Requests per second
+DEFAULT_BURST = 10  # Requests allowed back to back
+MAX_QUEUED_REQUESTS = 200  # Waiters allowed before new requests are rejected
+
+# Retry settings for 429/503 and transient network errors
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5  # Seconds before the first retry
+BACKOFF_MAX = 8.0
+MAX_RETRY_AFTER = 60.0  # Longer Retry-After values fail fast instead of waiting
+
+# Listing pages fetched ahead of the one being consumed by the iter_* methods
+DEFAULT_READ_AHEAD = 2
+
+# Lookups a bulk get_*_bulk call runs at once (the rate limiter still applies)
+BULK_CONCURRENCY = 5
+
+# Lower values are served first when the rate limit budget is tight
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+# Gateway mode: bot processes send requests to a local sidecar (api_gateway.py) that owns
+# the pool, cache, coalescing and the rate limit budget for all of them
+PRIORITY_HEADER = "X-Flavortown-Priority"
+GATEWAY_RATE_LIMIT = 100.0  # Local limit for gateway clients; the sidecar enforces the real one
+GATEWAY_MAX_RETRIES = 1  # The sidecar already retried upstream
+
+# Endpoint pattern -> CACHE_TTLS key, for requests that arrive by path (the gateway)
+CACHE_ROUTES = [
+    (re.compile(r"^/store$"), "store"),
+    (re.compile(r"^/store/\d+$"), "store_item"),
+    (re.compile(r"^/projects/\d+$"), "project"),
+    (re.compile(r"^/users/\d+$"), "user"),
+    (re.compile(r"^/devlogs/\d+$"), "devlog"),
+]
+
+# Endpoint pattern -> parser turning GET responses into compact models (see models.py)
+MODEL_ROUTES = [
+    (re.compile(r"^/store$"), models.parse_records(models.StoreItem)),
+    (re.compile(r"^/store/\d+$"), models.parse_record(models.StoreItem)),
+    (re.compile(r"^/projects$"), models.parse_listing("projects")),
+    (re.compile(r"^/projects/\d+$"), models.parse_record(models.Project)),
+    (re.compile(r"^/users$"), models.parse_listing("users")),
+    (re.compile(r"^/users/\d+$"), models.parse_record(models.User)),
+    (re.compile(r"^/devlogs$"), models.parse_listing("devlogs")),
+    (re.compile(r"^/devlogs/\d+$"), models.parse_record(models.Devlog)),
+]
+
+# listener(method, endpoint, status, seconds), called after every upstream attempt
+RequestListener = Callable[[str, str, int, float], Any]
+
+_request_priority: ContextVar[int] = ContextVar("flavortown_request_priority", default=PRIORITY_INTERACTIVE)
+
+CacheKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+
+class FlavorTownAPIError(ValueError):
+    # Error returned by the API (or raised while talking to it)
+    def __init__(
+        self,
+        message: str,
+        status: Optional[int] = None,
+        retry_after: Optional[float] = None,
+        detail: Optional[str] = None,
+    ):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+        # Upstream's own error message, without our prefix
+        self.detail = detail if detail is not None else message
+
+
+class RateLimitError(FlavorTownAPIError):
+    # The request could not be made within the rate limit budget
+    pass
+
+
+@contextmanager
+def request_priority(priority: int):
+    # Run API calls made inside this block at the given priority
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def background_priority():
+    # Run API calls made inside this block behind interactive ones
+    return request_priority(PRIORITY_BACKGROUND)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    # Parse a Retry-After header given in seconds or as an HTTP date
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int) -> float:
+    # Exponential backoff with jitter for the given retry attempt (0-based)
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class RateLimiter:
+    # Token bucket with a bounded priority queue in front of it
+
+    def __init__(self, rate: float = DEFAULT_RATE_LIMIT, burst: int = DEFAULT_BURST, max_queue: int = MAX_QUEUED_REQUESTS):
+        self.rate = rate
+        self.burst = burst
+        self.max_queue = max_queue
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiters: List[Tuple[int, int, "asyncio.Future"]] = []
+        self._counter = itertools.count()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def tokens(self) -> float:
+        # Tokens currently available
+        self._refill()
+        return self._tokens
+
+    @property
+    def pending(self) -> int:
+        # Requests waiting for a token
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    async def acquire(self, priority: int = PRIORITY_INTERACTIVE) -> None:
+        # Wait for a token; lower priority values are served first
+        self._refill()
+        now = time.monotonic()
+        if not self.pending and self._tokens >= 1 and now >= self._blocked_until:
+            self._tokens -= 1
+            return
+        if self._blocked_until - now > MAX_RETRY_AFTER:
+            # Upstream asked for a long pause; fail fast instead of queueing until it ends
+            raise RateLimitError(
+                "Flavortown API is rate limiting us, try again shortly", retry_after=self._blocked_until - now
+            )
+        if self.pending >= self.max_queue:
+            raise RateLimitError("Too many requests queued, try again shortly")
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        self._schedule()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # A token was granted after we gave up; hand it to the next waiter
+                self._tokens = min(self.burst, self._tokens + 1)
+                self._release()
+            raise
+
+    def pause(self, seconds: float) -> None:
+        # Stop handing out tokens for a while (e.g. after a 429)
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        if seconds > MAX_RETRY_AFTER:
+            # Requests already queued would otherwise wait out the whole pause
+            error = RateLimitError("Flavortown API is rate limiting us, try again shortly", retry_after=seconds)
+            for _, _, future in self._waiters:
+                if not future.done():
+                    future.set_exception(error)
+            self._waiters = []
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _release(self) -> None:
+        # Hand available tokens to the highest priority waiters
+        self._wakeup = None
+        self._refill()
+        while self._waiters and time.monotonic() >= self._blocked_until:
+            _, _, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._tokens < 1:
+                break
+            heapq.heappop(self._waiters)
+            self._tokens -= 1
+            future.set_result(None)
+        self._schedule()
+
+    def _schedule(self) -> None:
+        # Wake up when the next token (or the end of a pause) is due
+        if self._wakeup is not None or not self._waiters:
+            return
+        now = time.monotonic()
+        delay = max(self._blocked_until - now, (1 - self._tokens) / self.rate, 0)
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._release)
+
+
+def make_cache_key(method: str, endpoint: str, params: Optional[Dict] = None) -> CacheKey:
+    # Build a hashable key for a request
+    items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    return (method.upper(), endpoint, items)
+
+
+class ResponseCache:
+    # In-process TTL + LRU cache for API responses, bounded by entry count and body size
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, Tuple[float, int, Any]]" = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        # Return a fresh cached value, or None on a miss
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, size, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: CacheKey, value: Any, ttl: float, size: int) -> None:
+        # Store a value, evicting least recently used entries to stay within bounds
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, size, value)
+        self.size_bytes += size
+        while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, endpoint: str) -> int:
+        # Drop every entry for an endpoint (any params); returns how many were removed
+        keys = [key for key in self._entries if key[1] == endpoint]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def dump(self) -> List[List[Any]]:
+        # Fresh entries as [key, remaining ttl, size, value], least recently used first
+        now = time.monotonic()
+        return [
+            [list(key[:2]) + [list(map(list, key[2]))], expires_at - now, size, value]
+            for key, (expires_at, size, value) in self._entries.items()
+            if expires_at > now
+        ]
+
+    def load(
+        self, entries: Iterable[List[Any]], age: float = 0.0, parse: Optional[Callable[[str, Any], Any]] = None
+    ) -> int:
+        # Restore dump() output taken `age` seconds ago, passing each value through
+        # parse(endpoint, value) if given; returns how many entries were still fresh
+        loaded = 0
+        for (method, endpoint, params), ttl, size, value in entries:
+            if ttl - age > 0:
+                if parse is not None:
+                    value = parse(endpoint, value)
+                self.set((method, endpoint, tuple(map(tuple, params))), value, ttl - age, size)
+                loaded += 1
+        return loaded
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _remove(self, key: CacheKey) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.size_bytes -= size
+
+
+class NullCache(ResponseCache):
+    # Cache that stores nothing, for clients whose gateway does the caching
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        return None
+
+    def set(self, key: CacheKey, value: Any, ttl: float, size: int) -> None:
+        pass
+
+    def dump(self) -> List[List[Any]]:
+        return []
+
+
+def cache_ttl_for(endpoint: str) -> Optional[float]:
+    # Cache TTL for a GET endpoint, or None if its responses are not cached
+    for pattern, kind in CACHE_ROUTES:
+        if pattern.match(endpoint):
+            return CACHE_TTLS[kind]
+    return None
+
+
+def parse_response(endpoint: str, payload: Any) -> Any:
+    # Convert a parsed GET response into models, if the endpoint has any
+    for pattern, parse in MODEL_ROUTES:
+        if pattern.match(endpoint):
+            return parse(payload)
+    return payload
+
 
 class FlavorTownAPI:
     # Client for interacting with the Flavortown API
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        cache: Optional[ResponseCache] = None,
+        rate_limit: float = DEFAULT_RATE_LIMIT,
+        burst: int = DEFAULT_BURST,
+        base_url: str = BASE_URL,
+        unix_socket: Optional[str] = None,
+        max_retries: int = MAX_RETRIES,
+        forward_priority: bool = False,
+    ):
         self.api_key = api_key
-        self.base_url = BASE_URL
-        self.headers = {"Authorization": f"Bearer {api_key}"}
+        self.base_url = base_url.rstrip("/")
+        self.unix_socket = unix_socket
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.cache = cache if cache is not None else ResponseCache()
+        self._inflight: Dict[CacheKey, "asyncio.Future"] = {}
+        self.rate_limiter = RateLimiter(rate_limit, burst)
+        self.max_retries = max_retries
+        # Tell the server each request's priority (set when the server is our gateway)
+        self.forward_priority = forward_priority
+        self._request_listeners: List[RequestListener] = []
+
+    @classmethod
+    def gateway_client(cls, url: Optional[str] = None, unix_socket: Optional[str] = None) -> "FlavorTownAPI":
+        # Thin client for a local gateway: no local cache, and the gateway holds the API key
+        # and the shared rate limit
+        if unix_socket:
+            # The host is ignored when connecting over a Unix socket
+            url = "http://gateway"
+        if not url:
+            raise ValueError("A gateway URL or Unix socket path is required")
+        return cls(
+            "",
+            cache=NullCache(),
+            rate_limit=GATEWAY_RATE_LIMIT,
+            burst=int(GATEWAY_RATE_LIMIT),
+            base_url=f"{url.rstrip('/')}/api/v1",
+            unix_socket=unix_socket,
+            max_retries=GATEWAY_MAX_RETRIES,
+            forward_priority=True,
+        )
+
+    def add_request_listener(self, listener: RequestListener) -> None:
+        # Call listener(method, endpoint, status, seconds) after every upstream attempt;
+        # status is 0 when the request failed without a response
+        self._request_listeners.append(listener)
+
+    def _notify_request(self, method: str, endpoint: str, status: int, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        for listener in self._request_listeners:
+            listener(method, endpoint, status, elapsed)
+
+    async def __aenter__(self) -> "FlavorTownAPI":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        # Open the shared session (called from the bot's setup hook)
+        self._get_session()
+
+    async def close(self) -> None:
+        # Close the shared session and every pooled connection
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Return the long-lived session, creating it on first use
+        if self._session is None or self._session.closed:
+            if self.unix_socket:
+                connector = aiohttp.UnixConnector(
+                    path=self.unix_socket, limit=POOL_LIMIT, keepalive_timeout=KEEPALIVE_TIMEOUT
+                )
+            else:
+                connector = aiohttp.TCPConnector(
+                    limit=POOL_LIMIT,
+                    limit_per_host=POOL_LIMIT_PER_HOST,
+                    keepalive_timeout=KEEPALIVE_TIMEOUT,
+                    ttl_dns_cache=DNS_CACHE_TTL,
+                )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            )
+        return self._session
 
     async def _request(
-        self, method: str, endpoint: str, params: Optional[Dict] = None
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+        *,
+        ttl: Optional[float] = None,
+        use_cache: bool = True,
     ) -> Dict[str, Any]:
-        # Make an HTTP request to the API
+        # Make an HTTP request to the API, serving GETs with a ttl from the cache
+        cacheable = method == "GET" and ttl is not None
+        key = make_cache_key(method, endpoint, params)
+        if cacheable and use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        if method != "GET":
+            _, result = await self._fetch(method, endpoint, params, data)
+            return result
+
+        # Coalesce concurrent identical GETs onto one upstream request
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_shared(key, endpoint, params, ttl, use_cache))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish_inflight(key, t))
+        # Shield so a cancelled waiter does not cancel the request for everyone else
+        return await asyncio.shield(task)
+
+    async def _fetch_shared(
+        self, key: CacheKey, endpoint: str, params: Optional[Dict], ttl: Optional[float], use_cache: bool = True
+    ) -> Any:
+        # Body of a coalesced GET: fetch once and populate the cache
+        # A gateway must not answer a cache-bypassing request from its own cache
+        headers = {"Cache-Control": "no-cache"} if self.forward_priority and not use_cache else None
+        body, result = await self._fetch("GET", endpoint, params, headers=headers)
+        result = parse_response(endpoint, result)
+        # Only the request still registered for this key may fill the cache; one detached
+        # by invalidate() carries pre-change data even if a newer request is now in flight
+        if ttl is not None and self._inflight.get(key) is asyncio.current_task():
+            self.cache.set(key, result, ttl, len(body))
+        return result
+
+    def _finish_inflight(self, key: CacheKey, task: "asyncio.Future") -> None:
+        # Forget a finished shared request and mark its error as retrieved
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    async def _fetch(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[bytes, Any]:
+        # Perform one upstream request and return the raw body with its parsed JSON,
+        # retrying on 429/503 and (for GETs) transient network errors
         url = f"{self.base_url}{endpoint}"
-        async with aiohttp.ClientSession() as session:
-            async with session.request(
-                method, url, headers=self.headers, params=params
-            ) as response:
-                if response.status == 401:
-                    raise ValueError("Invalid API key")
-                if response.status == 404:
-                    raise ValueError("Resource not found")
-                if response.status >= 400:
-                    error_data = await response.json()
-                    raise ValueError(f"API Error: {error_data.get('error', 'Unknown error')}")
-                return await response.json()
+        priority = _request_priority.get()
+        if self.forward_priority:
+            headers = {**(headers or {}), PRIORITY_HEADER: str(priority)}
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire(priority)
+            started = time.perf_counter()
+            try:
+                session = self._get_session()
+                async with session.request(method, url, params=params, data=data, headers=headers) as response:
+                    body = await response.read()
+                    self._notify_request(method, endpoint, response.status, started)
+                    if response.status in (429, 503):
+                        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                        delay = retry_after if retry_after is not None else backoff_delay(attempt)
+                        # Hold back every request, not just this one, even when we give up
+                        self.rate_limiter.pause(delay)
+                        if attempt < self.max_retries and delay <= MAX_RETRY_AFTER:
+                            continue
+                        raise RateLimitError(
+                            "Flavortown API is rate limiting us, try again shortly",
+                            status=response.status,
+                            retry_after=delay,
+                        )
+                    if response.status >= 400:
+                        raise self._error_for(response.status, body)
+                    return body, models.loads(body)
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+                self._notify_request(method, endpoint, 0, started)
+                if method != "GET" or attempt >= self.max_retries:
+                    raise FlavorTownAPIError(f"Network error: {e or type(e).__name__}") from e
+                await asyncio.sleep(backoff_delay(attempt))
+        raise RateLimitError("Flavortown API is rate limiting us, try again shortly")
+
+    @staticmethod
+    def _error_for(status: int, body: bytes) -> FlavorTownAPIError:
+        # Build the error for a failed response; the body may not be JSON
+        if status == 401:
+            return FlavorTownAPIError("Invalid API key", status)
+        if status == 404:
+            return FlavorTownAPIError("Resource not found", status)
+        try:
+            message = json.loads(body).get("error", "Unknown error")
+        except (ValueError, AttributeError):
+            message = body.decode("utf-8", "replace").strip()[:200] or "Unknown error"
+        return FlavorTownAPIError(f"API Error: {message}", status, detail=message)
+
+    async def proxy_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+        use_cache: bool = True,
+    ) -> Any:
+        # Forward a request that arrived by path (used by the gateway), caching
+        # GETs by endpoint and invalidating an endpoint after a successful write
+        method = method.upper()
+        ttl = cache_ttl_for(endpoint) if method == "GET" else None
+        result = await self._request(method, endpoint, params, data, ttl=ttl, use_cache=use_cache)
+        if method != "GET":
+            self.invalidate(endpoint)
+        return result
+
+    def invalidate(self, endpoint: str) -> None:
+        # Forget cached data for an endpoint after it changes
+        self.cache.invalidate(endpoint)
+        # Requests already in flight may carry stale data; new callers start fresh
+        for key in [key for key in self._inflight if key[1] == endpoint]:
+            del self._inflight[key]
+
+    def invalidate_project(self, project_id: int) -> None:
+        # Forget cached data for a project after it changes
+        self.invalidate(f"/projects/{project_id}")
+
+    def _listing_fetcher(self, listing: str, query: Optional[str] = None) -> Callable[[int], Awaitable[Dict]]:
+        # page -> listing page, for "projects", "users" or "devlogs"
+        if listing == "projects":
+            return lambda page: self.get_projects(page=page, query=query)
+        if listing == "users":
+            return lambda page: self.get_users(page=page, query=query)
+        if listing == "devlogs":
+            if query:
+                raise ValueError("Devlogs cannot be searched upstream")
+            return lambda page: self.get_devlogs(page=page)
+        raise ValueError(f"Unknown listing: {listing}")
+
+    async def iter_pages(
+        self,
+        listing: str,
+        query: Optional[str] = None,
+        start_page: int = 1,
+        read_ahead: int = DEFAULT_READ_AHEAD,
+        max_pages: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[int, Dict]]:
+        # Yield (page number, page) for a listing in order, with up to read_ahead later pages
+        # being fetched while the caller works; only those pages are held in memory.
+        # Stops at the first empty page. Pending fetches are cancelled when iteration stops.
+        fetch = self._listing_fetcher(listing, query)
+        read_ahead = max(1, read_ahead)
+        result = await fetch(start_page)
+        total_pages = result.get("pagination", {}).get("total_pages", 1)
+        if start_page > total_pages:
+            return
+        last_page = total_pages if max_pages is None else min(total_pages, start_page + max_pages - 1)
+
+        page = start_page
+        next_page = start_page + 1
+        pending: Deque[Tuple[int, "asyncio.Task"]] = deque()
+        try:
+            while True:
+                while next_page <= last_page and len(pending) < read_ahead:
+                    task = asyncio.ensure_future(fetch(next_page))
+                    # Fetches abandoned by an early stop should not log "exception was never retrieved"
+                    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+                    pending.append((next_page, task))
+                    next_page += 1
+                yield page, result
+                if not result.get(listing) or not pending:
+                    return
+                page, task = pending.popleft()
+                result = await task
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def _iter_records(
+        self, listing: str, query: Optional[str], limit: Optional[int], read_ahead: int
+    ) -> AsyncIterator[Dict]:
+        count = 0
+        pages = self.iter_pages(listing, query, read_ahead=read_ahead)
+        try:
+            async for _, result in pages:
+                for record in result.get(listing, []):
+                    yield record
+                    count += 1
+                    if limit is not None and count >= limit:
+                        return
+        finally:
+            await pages.aclose()
+
+    def iter_projects(
+        self, query: Optional[str] = None, limit: Optional[int] = None, read_ahead: int = DEFAULT_READ_AHEAD
+    ) -> AsyncIterator[Dict]:
+        # Stream every project (matching query), stopping after limit records
+        return self._iter_records("projects", query, limit, read_ahead)
+
+    def iter_users(
+        self, query: Optional[str] = None, limit: Optional[int] = None, read_ahead: int = DEFAULT_READ_AHEAD
+    ) -> AsyncIterator[Dict]:
+        # Stream every user (matching query), stopping after limit records
+        return self._iter_records("users", query, limit, read_ahead)
+
+    def iter_devlogs(self, limit: Optional[int] = None, read_ahead: int = DEFAULT_READ_AHEAD) -> AsyncIterator[Dict]:
+        # Stream every devlog, stopping after limit records
+        return self._iter_records("devlogs", None, limit, read_ahead)
 
     async def get_projects(self, page: int = 1, query: Optional[str] = None) -> Dict:
         # Fetch a list of projects
@@ -38,9 +686,33 @@ class FlavorTownAPI:
             params["query"] = query
         return await self._request("GET", "/projects", params)
 
-    async def get_project(self, project_id: int) -> Dict:
+    async def get_project(self, project_id: int, use_cache: bool = True) -> Dict:
         # Fetch a specific project by ID
-        return await self._request("GET", f"/projects/{project_id}")
+        return await self._request("GET", f"/projects/{project_id}", ttl=CACHE_TTLS["project"], use_cache=use_cache)
+
+    async def _get_bulk(
+        self, getter: Callable[[int], Awaitable[Dict]], ids: Iterable[int], concurrency: int
+    ) -> Dict[int, Union[Dict, FlavorTownAPIError]]:
+        # Fetch several entities through the cache with bounded concurrency.
+        # Failed lookups map to their error instead of failing the whole batch.
+        ids = list(dict.fromkeys(ids))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(entity_id: int) -> Dict:
+            async with semaphore:
+                return await getter(entity_id)
+
+        results = await asyncio.gather(*(fetch(entity_id) for entity_id in ids), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, FlavorTownAPIError):
+                raise result
+        return dict(zip(ids, results))
+
+    async def get_projects_bulk(
+        self, project_ids: Iterable[int], concurrency: int = BULK_CONCURRENCY
+    ) -> Dict[int, Union[Dict, FlavorTownAPIError]]:
+        # Fetch several projects by ID: id -> project, or the error for that ID
+        return await self._get_bulk(self.get_project, project_ids, concurrency)
 
     async def create_project(
         self,
@@ -65,45 +737,29 @@ class FlavorTownAPI:
         if ai_declaration:
             data["ai_declaration"] = ai_declaration
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.base_url}/projects",
-                headers=self.headers,
-                data=data,
-            ) as response:
-                if response.status >= 400:
-                    error_data = await response.json()
-                    raise ValueError(f"API Error: {error_data.get('error', 'Unknown error')}")
-                return await response.json()
+        return await self._request("POST", "/projects", data=data)
 
     async def update_project(self, project_id: int, **kwargs) -> Dict:
         # Update an existing project
-        async with aiohttp.ClientSession() as session:
-            async with session.patch(
-                f"{self.base_url}/projects/{project_id}",
-                headers=self.headers,
-                data=kwargs,
-            ) as response:
-                if response.status >= 400:
-                    error_data = await response.json()
-                    raise ValueError(f"API Error: {error_data.get('error', 'Unknown error')}")
-                return await response.json()
+        result = await self._request("PATCH", f"/projects/{project_id}", data=kwargs)
+        self.invalidate_project(project_id)
+        return result
 
     async def get_devlogs(self, page: int = 1) -> Dict:
         # Fetch all devlogs
         return await self._request("GET", "/devlogs", {"page": page})
 
-    async def get_devlog(self, devlog_id: int) -> Dict:
+    async def get_devlog(self, devlog_id: int, use_cache: bool = True) -> Dict:
         # Fetch a specific devlog by ID
-        return await self._request("GET", f"/devlogs/{devlog_id}")
+        return await self._request("GET", f"/devlogs/{devlog_id}", ttl=CACHE_TTLS["devlog"], use_cache=use_cache)
 
-    async def get_store_items(self) -> List[Dict]:
+    async def get_store_items(self, use_cache: bool = True) -> List[Dict]:
         # Fetch all store items
-        return await self._request("GET", "/store")
+        return await self._request("GET", "/store", ttl=CACHE_TTLS["store"], use_cache=use_cache)
 
-    async def get_store_item(self, item_id: int) -> Dict:
+    async def get_store_item(self, item_id: int, use_cache: bool = True) -> Dict:
         # Fetch a specific store item by ID
-        return await self._request("GET", f"/store/{item_id}")
+        return await self._request("GET", f"/store/{item_id}", ttl=CACHE_TTLS["store_item"], use_cache=use_cache)
 
     async def get_users(self, page: int = 1, query: Optional[str] = None) -> Dict:
         # Fetch a list of users
@@ -112,6 +768,12 @@ class FlavorTownAPI:
             params["query"] = query
         return await self._request("GET", "/users", params)
 
-    async def get_user(self, user_id: int) -> Dict:
+    async def get_user(self, user_id: int, use_cache: bool = True) -> Dict:
         # Fetch a specific user by ID
-        return await self._request("GET", f"/users/{user_id}")
+        return await self._request("GET", f"/users/{user_id}", ttl=CACHE_TTLS["user"], use_cache=use_cache)
+
+    async def get_users_bulk(
+        self, user_ids: Iterable[int], concurrency: int = BULK_CONCURRENCY
+    ) -> Dict[int, Union[Dict, FlavorTownAPIError]]:
+        # Fetch several users by ID: id -> user, or the error for that ID
+        return await self._get_bulk(self.get_user, user_ids, concurrency)
@@ -0,0 +1,143 @@
+import asyncio
+import bisect
+import heapq
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from datastore import DataStore
+
+# User field -> leaderboard title
+LEADERBOARD_METRICS = {
+    "cookies": "Cookies",
+    "vote_count": "Votes",
+    "like_count": "Likes",
+    "devlog_seconds_total": "Devlog Time",
+}
+TOP_K = 25  # Entries a leaderboard can show
+TOP_K_SLACK = 25  # Extra entries kept so members whose score drops can be replaced without a rescan
+RECOMPUTE_INTERVAL = 3600  # Seconds between full recomputes from the local store
+RECOMPUTE_CHUNK = 1000  # Records read per query during a recompute
+
+
+class TopK:
+    # The highest scores seen, kept sorted so the top n can be read in O(n).
+    # Updates are O(capacity); a member whose score drops below the tail can hide an
+    # outsider with a higher score until the next rebuild.
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._order: List[Tuple[float, int]] = []  # (-score, id), best first
+        self._scores: Dict[int, float] = {}
+        self._labels: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def update(self, key: int, score: float, label: str) -> None:
+        old = self._scores.get(key)
+        if old is not None:
+            self._labels[key] = label
+            if old == score:
+                return
+            del self._order[bisect.bisect_left(self._order, (-old, key))]
+        elif len(self._order) >= self.capacity and (-score, key) >= self._order[-1]:
+            # Not good enough to join
+            return
+        bisect.insort(self._order, (-score, key))
+        self._scores[key] = score
+        self._labels[key] = label
+        if len(self._order) > self.capacity:
+            _, evicted = self._order.pop()
+            del self._scores[evicted]
+            del self._labels[evicted]
+
+    def top(self, n: int) -> List[Tuple[int, str, float]]:
+        # (id, label, score) for the best n entries
+        return [(key, self._labels[key], -score) for score, key in self._order[:n]]
+
+    def rebuild(self, entries: Iterable[Tuple[float, int, str]]) -> None:
+        # Replace the contents with (score, id, label) entries
+        best = heapq.nlargest(self.capacity, entries, key=lambda entry: (entry[0], -entry[1]))
+        self._order = [(-score, key) for score, key, _ in best]
+        self._order.sort()
+        self._scores = {key: score for score, key, _ in best}
+        self._labels = {key: label for _, key, label in best}
+
+
+class Leaderboards:
+    # Top users per metric, updated as user records arrive and recomputed periodically from the store
+
+    def __init__(self, store: DataStore, top_k: int = TOP_K):
+        self.store = store
+        self.top_k = top_k
+        self.boards = {metric: TopK(top_k + TOP_K_SLACK) for metric in LEADERBOARD_METRICS}
+        self.recomputed_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, kind: str, records: Iterable[Dict[str, Any]]) -> None:
+        # Sync/index listener: fold new or changed user records into every board
+        if kind != "user":
+            return
+        for record in records:
+            user_id = record.get("id")
+            if user_id is None:
+                continue
+            label = record.get("display_name") or f"User {user_id}"
+            for metric, board in self.boards.items():
+                score = record.get(metric)
+                if isinstance(score, (int, float)):
+                    board.update(user_id, score, label)
+
+    def top(self, metric: str, n: Optional[int] = None) -> List[Tuple[int, str, float]]:
+        return self.boards[metric].top(min(n or self.top_k, self.top_k))
+
+    async def recompute(self) -> int:
+        # Rebuild every board from the local store, yielding to the loop between chunks;
+        # returns how many users were scanned
+        heaps: Dict[str, List[Tuple[float, int, str]]] = {metric: [] for metric in LEADERBOARD_METRICS}
+        capacity = self.top_k + TOP_K_SLACK
+        scanned = 0
+        last_id = 0
+        while True:
+            records = self.store.records_after("user", last_id, RECOMPUTE_CHUNK)
+            if not records:
+                break
+            for record in records:
+                label = record.get("display_name") or f"User {record['id']}"
+                for metric, heap in heaps.items():
+                    score = record.get(metric)
+                    if not isinstance(score, (int, float)):
+                        continue
+                    entry = (score, -record["id"], label)
+                    if len(heap) < capacity:
+                        heapq.heappush(heap, entry)
+                    elif entry > heap[0]:
+                        heapq.heapreplace(heap, entry)
+            scanned += len(records)
+            last_id = records[-1]["id"]
+            await asyncio.sleep(0)
+        for metric, heap in heaps.items():
+            self.boards[metric].rebuild((score, -negative_id, label) for score, negative_id, label in heap)
+        self.recomputed_at = time.time()
+        return scanned
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.recompute()
+            except Exception as e:
+                # Keep the incremental boards and try again next interval
+                print(f"Leaderboard recompute failed: {type(e).__name__}: {e}")
+            await asyncio.sleep(RECOMPUTE_INTERVAL)
@@ -1,494 +1,755 @@
 import discord
 from discord.ext import commands
-from discord import ui
+from discord import app_commands, ui
 import os
 import asyncio
+import math
+import time
+from collections import OrderedDict
+from typing import Optional
 from dotenv import load_dotenv
-from flavortown_api import FlavorTownAPI
+from analytics import MAX_DAILY_BARS, STATS_WINDOWS, DevlogAnalytics
+import custom_ids
+from datastore import DataStore
+from delete_scheduler import DeleteScheduler
+import diagnostics
+import embeds
+from leaderboard import LEADERBOARD_METRICS, TOP_K, Leaderboards
+import metrics
+from metrics import MetricsServer
+from prefix_index import PrefixIndex
+from flavortown_api import FlavorTownAPI, BASE_URL, DEFAULT_RATE_LIMIT, DEFAULT_BURST, background_priority
+from search_index import KINDS as SEARCHABLE_KINDS, SearchIndex
+from shard_metrics import ShardMetrics, parse_shard_ids
+import startup
+from store_catalog import StoreCatalog
+from store_feed import StoreFeed
+from sync import SyncEngine
 
 # Load environment variables
 load_dotenv()
 
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
 FLAVORTOWN_API_KEY = os.getenv("FLAVORTOWN_API_KEY")
+FLAVORTOWN_RATE_LIMIT = float(os.getenv("FLAVORTOWN_RATE_LIMIT", DEFAULT_RATE_LIMIT))
+FLAVORTOWN_RATE_BURST = int(os.getenv("FLAVORTOWN_RATE_BURST", DEFAULT_BURST))
+FLAVORTOWN_API_URL = os.getenv("FLAVORTOWN_API_URL", BASE_URL)  # e.g. the benchmark mock server
+
+# Sharding: set SHARD_COUNT (and optionally SHARD_IDS, e.g. "0-3") to run one of several
+# bot processes, or SHARDED=1 to let Discord pick the shard count for a single process
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0")) or None
+SHARD_IDS = parse_shard_ids(os.getenv("SHARD_IDS"))
+SHARDED = os.getenv("SHARDED", "0") == "1" or SHARD_COUNT is not None or SHARD_IDS is not None
+# The primary process runs the background jobs that must only run once (sync, store notifications)
+IS_PRIMARY = SHARD_IDS is None or 0 in SHARD_IDS
+PROCESS_NAME = f"shards-{min(SHARD_IDS)}-{max(SHARD_IDS)}" if SHARD_IDS else "main"
+AUTOCOMPLETE_RELOAD_INTERVAL = 600  # Seconds between autocomplete reloads in non-primary processes
+AUTOCOMPLETE_LOAD_CHUNK = 5000  # Records read per query while filling the autocomplete indexes
+
+# Set METRICS_PORT to serve Prometheus/OpenMetrics metrics from http://METRICS_HOST:METRICS_PORT/metrics
+# (each sharded process needs its own port)
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0")) or None
+
+# Set DIAGNOSTICS=1 to log slow callbacks, loop stalls and per-command spans to DIAGNOSTICS_FILE
+DIAGNOSTICS = os.getenv("DIAGNOSTICS", "0") == "1"
+DIAGNOSTICS_FILE = os.getenv("DIAGNOSTICS_FILE", "diagnostics.log" if PROCESS_NAME == "main" else f"diagnostics-{PROCESS_NAME}.log")
+DIAGNOSTICS_SLOW_CALLBACK = float(os.getenv("DIAGNOSTICS_SLOW_CALLBACK", diagnostics.DEFAULT_SLOW_CALLBACK))
+DIAGNOSTICS_STALL = float(os.getenv("DIAGNOSTICS_STALL", diagnostics.DEFAULT_STALL))
+
+# Commands are synced from setup_hook only when the command tree changed; FORCE_COMMAND_SYNC=1 always syncs
+FORCE_COMMAND_SYNC = os.getenv("FORCE_COMMAND_SYNC", "0") == "1"
+# The response cache and store catalog are saved here on shutdown and restored on the next start
+SNAPSHOT_FILE = os.getenv("SNAPSHOT_FILE", "snapshot.json" if PROCESS_NAME == "main" else f"snapshot-{PROCESS_NAME}.json")
+
+# Gateway mode: send API calls through a local api_gateway.py sidecar shared by every bot process
+FLAVORTOWN_GATEWAY_URL = os.getenv("FLAVORTOWN_GATEWAY_URL")
+FLAVORTOWN_GATEWAY_SOCKET = os.getenv("FLAVORTOWN_GATEWAY_SOCKET")
+
+# Initialize API client
+if FLAVORTOWN_GATEWAY_URL or FLAVORTOWN_GATEWAY_SOCKET:
+    api = FlavorTownAPI.gateway_client(FLAVORTOWN_GATEWAY_URL, FLAVORTOWN_GATEWAY_SOCKET)
+else:
+    api = FlavorTownAPI(
+        FLAVORTOWN_API_KEY, rate_limit=FLAVORTOWN_RATE_LIMIT, burst=FLAVORTOWN_RATE_BURST, base_url=FLAVORTOWN_API_URL
+    )
+
+
+class InstrumentedTree(app_commands.CommandTree):
+    # Command tree that times every slash command for the metrics endpoint
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        metrics.command_started(interaction)
+        diagnostics.start_trace(interaction)
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        metrics.command_finished(interaction, "error")
+        diagnostics.finish_trace(interaction, "error")
+        await super().on_error(interaction, error)
+
+
+class FlavorTownBot(commands.AutoShardedBot if SHARDED else commands.Bot):
+    # Bot that owns the lifecycle of the shared API session and background services
+    def dispatch(self, event_name: str, /, *args, **kwargs):
+        shard_metrics.record_event(event_name, args)
+        super().dispatch(event_name, *args, **kwargs)
+
+    async def setup_hook(self):
+        if DIAGNOSTICS:
+            diagnostics.enable(DIAGNOSTICS_FILE, DIAGNOSTICS_SLOW_CALLBACK, DIAGNOSTICS_STALL)
+            api.add_request_listener(diagnostics.observe_api_request)
+        await api.start()
+        if metrics_server is not None:
+            await metrics_server.start()
+        search_index.open()
+        datastore.open()
+        store_feed.open()
+        # Autocomplete fills in the background rather than holding up the connection
+        asyncio.create_task(load_autocomplete_indexes())
+        startup.load_snapshot(SNAPSHOT_FILE, api.cache, store_catalog)
+        leaderboards.start()
+        devlog_analytics.start()
+        await delete_scheduler.start()
+        store_catalog.start()
+        if IS_PRIMARY and self.application_id is not None:
+            # Don't hold up the gateway connection on Discord's command sync
+            self.loop.create_task(startup.sync_commands(self.tree, datastore, self.application_id, FORCE_COMMAND_SYNC))
+        if SYNC_ENABLED and IS_PRIMARY:
+            sync_engine.start()
+        if not IS_PRIMARY:
+            self.loop.create_task(reload_autocomplete_indexes())
+
+    async def close(self):
+        await sync_engine.close()
+        await store_catalog.close()
+        startup.save_snapshot(SNAPSHOT_FILE, api.cache, store_catalog)
+        await delete_scheduler.close()
+        await leaderboards.close()
+        await devlog_analytics.close()
+        store_feed.close()
+        datastore.close()
+        search_index.close()
+        await api.close()
+        if metrics_server is not None:
+            await metrics_server.close()
+        diagnostics.disable()
+        await super().close()
+
 
 # Initialize bot
 intents = discord.Intents.default()
 intents.message_content = True
-bot = commands.Bot(command_prefix="/", intents=intents)
-
-# Initialize API client
-api = FlavorTownAPI(FLAVORTOWN_API_KEY)
+if SHARDED:
+    bot = FlavorTownBot(
+        command_prefix="/", intents=intents, tree_cls=InstrumentedTree, shard_count=SHARD_COUNT, shard_ids=SHARD_IDS
+    )
+else:
+    bot = FlavorTownBot(command_prefix="/", intents=intents, tree_cls=InstrumentedTree)
+shard_metrics = ShardMetrics(bot)
+metrics_server = MetricsServer(METRICS_HOST, METRICS_PORT) if METRICS_PORT else None
+metrics.register_api(api)
 
 # Auto-delete settings
 AUTO_DELETE_TIMEOUT = 60  # 5 minutes in seconds
+# Each process owns its own queue; the other stores below are shared between processes
+AUTO_DELETE_DB = os.getenv("AUTO_DELETE_DB", "autodelete.db" if PROCESS_NAME == "main" else f"autodelete-{PROCESS_NAME}.db")
+delete_scheduler = DeleteScheduler(bot, AUTO_DELETE_DB)
+metrics.register_gauge(
+    "flavortown_auto_delete_pending", "Messages waiting to be auto-deleted", lambda: delete_scheduler.depth
+)
+
+# Local search index, filled from every listing page we fetch
+SEARCH_INDEX_DB = os.getenv("SEARCH_INDEX_DB", "search.db")
+search_index = SearchIndex(SEARCH_INDEX_DB)
+
+# Background sync of the whole dataset into a local store
+DATA_DB = os.getenv("DATA_DB", "flavortown.db")
+SYNC_ENABLED = os.getenv("SYNC_ENABLED", "1") == "1"
+datastore = DataStore(DATA_DB)
+sync_engine = SyncEngine(api, datastore)
+
+
+# Autocomplete labels per kind, served from in-memory prefix indexes
+AUTOCOMPLETE_LABELS = {
+    "project": lambda record: record.get("title"),
+    "user": lambda record: record.get("display_name"),
+    "devlog": lambda record: f"#{record['id']} {(record.get('body') or '')[:80]}",
+    "store_item": lambda record: record.get("name"),
+}
+autocomplete_indexes = {kind: PrefixIndex() for kind in AUTOCOMPLETE_LABELS}
+
+# Top users per metric, updated from every user record we see
+leaderboards = Leaderboards(datastore)
+
+# Columnar devlog history behind /stats devlogs
+devlog_analytics = DevlogAnalytics(datastore)
+
+
+def index_records(kind, records):
+    """Feed fetched or synced records into the search and autocomplete indexes, leaderboards and analytics"""
+    if kind in SEARCHABLE_KINDS:
+        search_index.add(kind, records)
+    leaderboards.add(kind, records)
+    devlog_analytics.add(kind, records)
+    label = AUTOCOMPLETE_LABELS.get(kind)
+    if label is not None:
+        autocomplete_indexes[kind].update(
+            [(record["id"], label(record)) for record in records if record.get("id") is not None]
+        )
 
-def format_price_with_hours(biscuits):
-    """Format price showing both biscuits and equivalent hours (1h = 10 biscuits)"""
-    if biscuits is None or biscuits == 'N/A':
-        return 'N/A'
-    
-    hours = biscuits / 10
-    if hours == int(hours):
-        # Whole number of hours
-        return f"{biscuits} biscuits ({int(hours)}h)"
-    else:
-        # Decimal hours, show with 1 decimal place
-        return f"{biscuits} biscuits ({hours:.1f}h)"
-
-async def send_and_schedule_delete(interaction: discord.Interaction, content=None, *, embed=None, view=None, ephemeral=False):
-    """Send a message and schedule it for auto-deletion if not ephemeral"""
-    if ephemeral:
-        # Ephemeral messages disappear on their own
-        return await interaction.followup.send(content=content, embed=embed, view=view, ephemeral=True)
-    
-    # Send the message
-    if hasattr(interaction, 'response') and not interaction.response.is_done():
-        # Use response.send_message for initial responses
-        message = await interaction.response.send_message(content=content, embed=embed, view=view)
-    else:
-        # Use followup.send for follow-up messages
-        message = await interaction.followup.send(content=content, embed=embed, view=view, ephemeral=False)
+
+async def load_autocomplete_indexes():
+    """Fill the autocomplete indexes from the local store, yielding to the loop between chunks"""
+    for kind, index in autocomplete_indexes.items():
+        label = AUTOCOMPLETE_LABELS[kind]
+        last_id = 0
+        while True:
+            records = datastore.records_after(kind, last_id, AUTOCOMPLETE_LOAD_CHUNK)
+            if not records:
+                break
+            index.update([(record["id"], label(record)) for record in records])
+            last_id = records[-1]["id"]
+            await asyncio.sleep(0)
+        await index.compact()
+
+
+async def reload_autocomplete_indexes():
+    """Pick up records synced by the primary process from the shared store"""
+    while True:
+        await asyncio.sleep(AUTOCOMPLETE_RELOAD_INTERVAL)
+        await load_autocomplete_indexes()
+        await devlog_analytics.load()
+
+
+def on_full_sync(kind):
+    """Mark the search index complete and compact the autocomplete index after a full pass"""
+    search_index.mark_complete(kind)
+    asyncio.get_running_loop().create_task(autocomplete_indexes[kind].compact())
+
+
+sync_engine.add_listener(index_records)
+sync_engine.add_complete_listener(on_full_sync)
+
+# Precomputed store catalog, refreshed in the background
+store_catalog = StoreCatalog(api)
+
+
+def on_catalog_change(previous, snapshot):
+    """Store and index the new catalog contents"""
+    datastore.replace_all("store_item", snapshot.items)
+    index_records("store_item", snapshot.items)
+
+
+# Store change notifications for subscribed channels and users
+store_feed = StoreFeed(bot, DATA_DB)
+
+if IS_PRIMARY:
+    store_catalog.add_listener(on_catalog_change)
+    store_catalog.add_listener(store_feed.on_catalog_change)
+
+
+def autocomplete_choices(kind: str, current: str):
+    """Autocomplete choices for an ID argument, answered from memory only"""
+    return [
+        app_commands.Choice(name=label if kind == "devlog" else f"{label[:88]} (#{item_id})", value=item_id)
+        for item_id, label in autocomplete_indexes[kind].search(current)
+    ]
+
+# Pagination settings
+PAGE_CACHE_TTL = 120  # Seconds a fetched listing page is reused
+PAGE_CACHE_MAX = 256  # Listing pages kept across all messages
+PREFETCH_MIN_TOKENS = 2  # Rate limit tokens that must be spare before prefetching
+PAGE_EDIT_WAIT = 2  # Seconds to wait for an uncached page before deferring the click
+NO_QUERY = "-"  # Query key for listings without a query
+MAX_BULK_IDS = 10  # Discord allows 10 embeds per message
+MAX_MESSAGE_CHARS = 2000  # Discord's limit on message content
+
+async def send_and_schedule_delete(interaction: discord.Interaction, content=None, *, embed=None, embed_list=None, view=None, ephemeral=False):
+    """Send a message (with one embed or an embed_list) and schedule it for auto-deletion if not ephemeral"""
+    kwargs = {"embeds": embed_list} if embed_list is not None else {"embed": embed}
+    with diagnostics.span("send"):
+        if ephemeral:
+            # Ephemeral messages disappear on their own
+            return await interaction.followup.send(content=content, view=view, ephemeral=True, **kwargs)
+
+        # Send the message
+        if hasattr(interaction, 'response') and not interaction.response.is_done():
+            # Use response.send_message for initial responses
+            message = await interaction.response.send_message(content=content, view=view, **kwargs)
+        else:
+            # Use followup.send for follow-up messages
+            message = await interaction.followup.send(content=content, view=view, ephemeral=False, **kwargs)
     
     # Schedule auto-deletion
     if message:
-        asyncio.create_task(delete_message_after_delay(message, AUTO_DELETE_TIMEOUT))
+        delete_scheduler.schedule(message.channel.id, message.id, AUTO_DELETE_TIMEOUT)
     
     return message
 
 
-async def delete_message_after_delay(message: discord.Message, delay: int):
-    """Delete a message after the specified delay"""
+def parse_ids(text: str):
+    """Parse "12, 34 56" into unique IDs in the order given"""
+    ids = []
+    for token in text.replace(",", " ").split():
+        if not token.lstrip("#").isdigit():
+            raise ValueError(f"`{token}` is not an ID")
+        ids.append(int(token.lstrip("#")))
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        raise ValueError("Give at least one ID")
+    if len(ids) > MAX_BULK_IDS:
+        raise ValueError(f"At most {MAX_BULK_IDS} IDs at once")
+    return ids
+
+
+async def send_bulk(interaction: discord.Interaction, kind: str, single_id, ids_text, fetch_bulk, build_embed):
+    """Look up several entities at once and reply with one embed per entity found"""
     try:
-        await asyncio.sleep(delay)
-        await message.delete()
-    except discord.NotFound:
-        # Message was already deleted
-        pass
-    except discord.Forbidden:
-        # Bot doesn't have permission to delete the message
-        pass
-    except Exception as e:
-        print(f"Error deleting message: {e}")
-
-
-# Custom button views
-class PaginationView(ui.View):
-    # Navigation buttons for paginated results
-    def __init__(self, current_page: int, total_pages: int, callback):
-        super().__init__(timeout=180)
-        self.current_page = current_page
-        self.total_pages = total_pages
-        self.callback = callback
-        
-        if current_page > 1:
-            self.first_page.disabled = False
-            self.prev_page.disabled = False
-        else:
-            self.first_page.disabled = True
-            self.prev_page.disabled = True
-        
-        if current_page < total_pages:
-            self.next_page.disabled = False
-            self.last_page.disabled = False
-        else:
-            self.next_page.disabled = True
-            self.last_page.disabled = True
-
-    @ui.button(label="⏮️ First", style=discord.ButtonStyle.blurple)
-    async def first_page(self, interaction: discord.Interaction, button: ui.Button):
-        # Go to first page
-        await self.callback(interaction, 1)
-
-    @ui.button(label="◀️ Previous", style=discord.ButtonStyle.blurple)
-    async def prev_page(self, interaction: discord.Interaction, button: ui.Button):
-        # Go to previous page
-        await self.callback(interaction, self.current_page - 1)
-
-    @ui.button(label="Next ▶️", style=discord.ButtonStyle.blurple)
-    async def next_page(self, interaction: discord.Interaction, button: ui.Button):
-        # Go to next page
-        await self.callback(interaction, self.current_page + 1)
-
-    @ui.button(label="Last ⏭️", style=discord.ButtonStyle.blurple)
-    async def last_page(self, interaction: discord.Interaction, button: ui.Button):
-        # Go to last page
-        await self.callback(interaction, self.total_pages)
-
-
-class ProjectView(ui.View):
-    # Action buttons for project details
-    def __init__(self, project):
-        super().__init__(timeout=180)
-        self.project = project
-        
-        if not project.get("repo_url"):
-            self.repo_button.disabled = True
-        if not project.get("demo_url"):
-            self.demo_button.disabled = True
-
-    @ui.button(label="📚 Repository", style=discord.ButtonStyle.green, emoji="🔗")
-    async def repo_button(self, interaction: discord.Interaction, button: ui.Button):
-        # Open repository link
-        await interaction.response.send_message(f"Repository: {self.project['repo_url']}", ephemeral=True)
-
-    @ui.button(label="🎯 Live Demo", style=discord.ButtonStyle.green, emoji="🌐")
-    async def demo_button(self, interaction: discord.Interaction, button: ui.Button):
-        # Open demo link
-        await interaction.response.send_message(f"Live Demo: {self.project['demo_url']}", ephemeral=True)
-
-    @ui.button(label="📖 View Full Details", style=discord.ButtonStyle.primary)
-    async def details_button(self, interaction: discord.Interaction, button: ui.Button):
-        # Show full details
-        embed = discord.Embed(title=self.project["title"], description=self.project["description"], color=discord.Color.blue())
-        embed.add_field(name="ID", value=str(self.project["id"]), inline=True)
-        embed.add_field(name="Status", value=self.project.get("ship_status", "N/A"), inline=True)
-        embed.add_field(name="Created", value=self.project["created_at"][:10], inline=True)
-        if self.project.get("ai_declaration"):
-            embed.add_field(name="AI Declaration", value=self.project["ai_declaration"], inline=False)
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-
-
-class UserView(ui.View):
-    # Action buttons for user details
-    def __init__(self, user):
-        super().__init__(timeout=180)
-        self.user = user
-
-    @ui.button(label="📊 Stats", style=discord.ButtonStyle.primary, emoji="📈")
-    async def stats_button(self, interaction: discord.Interaction, button: ui.Button):
-        # Show user stats
-        embed = discord.Embed(title=f"{self.user['display_name']}'s Stats", color=discord.Color.orange())
-        embed.add_field(name="Votes", value=str(self.user.get("vote_count", 0)), inline=True)
-        embed.add_field(name="Likes", value=str(self.user.get("like_count", 0)), inline=True)
-        embed.add_field(name="Cookies", value=str(self.user.get("cookies", 0)), inline=True)
-        embed.add_field(name="Devlog Time (Today)", value=f"{self.user.get('devlog_seconds_today', 0)}s", inline=True)
-        embed.add_field(name="Devlog Time (Total)", value=f"{self.user.get('devlog_seconds_total', 0)}s", inline=True)
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-
-    @ui.button(label="🔗 Slack ID", style=discord.ButtonStyle.blurple)
-    async def slack_button(self, interaction: discord.Interaction, button: ui.Button):
-        # Show Slack ID
-        slack_id = self.user.get("slack_id", "Not linked")
-        await interaction.response.send_message(f"Slack ID: `{slack_id}`", ephemeral=True)
-
-
-class StoreItemView(ui.View):
-    # Action buttons for store items
-    def __init__(self, item):
-        super().__init__(timeout=180)
-        self.item = item
-
-    @ui.button(label="💰 Price Info", style=discord.ButtonStyle.success, emoji="💵")
-    async def price_button(self, interaction: discord.Interaction, button: ui.Button):
-        # Show pricing information
-        ticket_cost = self.item.get("ticket_cost", {})
-        base_cost = ticket_cost.get('base_cost')
-        
-        embed = discord.Embed(title=f"🍪 {self.item['name']} - Pricing", color=discord.Color.gold())
-        
-        # Check if all country prices are the same as base cost
-        country_prices = [ticket_cost.get('us'), ticket_cost.get('eu'), ticket_cost.get('uk'), ticket_cost.get('ca')]
-        all_same = all(price == base_cost for price in country_prices if price is not None)
-        
-        if all_same and base_cost is not None:
-            # All prices are the same, just show base cost
-            embed.add_field(name="Price", value=format_price_with_hours(base_cost), inline=False)
+        ids = parse_ids(" ".join(str(part) for part in (single_id, ids_text) if part is not None))
+    except ValueError as e:
+        await interaction.response.send_message(f"Error: {e}", ephemeral=True)
+        return
+    await diagnostics.defer(interaction)
+    results = await fetch_bulk(ids)
+    found = [result for result in results.values() if not isinstance(result, Exception)]
+    index_records(kind, found)
+    # IDs that failed the same way share one entry
+    failures = {}
+    for entity_id, result in results.items():
+        if isinstance(result, Exception):
+            failures.setdefault(str(result), []).append(f"#{entity_id}")
+    content = None
+    if failures:
+        content = "Could not load " + "; ".join(f"{', '.join(failed_ids)}: {error}" for error, failed_ids in failures.items())
+        content = content[:MAX_MESSAGE_CHARS]
+    try:
+        if not found:
+            await send_and_schedule_delete(interaction, content=content)
+            return
+        with diagnostics.span("render"):
+            embed_list = [build_embed(result) for result in found]
+        for batch in embeds.batch_embeds(embed_list):
+            await send_and_schedule_delete(interaction, content=content, embed_list=batch)
+            content = None
+    except discord.HTTPException as e:
+        await send_and_schedule_delete(interaction, content=f"Error: Discord rejected the reply ({e.status})")
+
+
+async def send_notice(interaction: discord.Interaction, content=None, *, embed=None):
+    """Answer a button click with a message only the clicking user sees"""
+    if interaction.response.is_done():
+        await interaction.followup.send(content, embed=embed, ephemeral=True)
+    else:
+        await interaction.response.send_message(content, embed=embed, ephemeral=True)
+
+
+async def wait_or_defer(interaction: discord.Interaction, task: asyncio.Future, ephemeral: bool = False):
+    """Wait for a task, deferring the interaction if it is not ready in time to answer directly"""
+    if not task.done():
+        await asyncio.wait({task}, timeout=PAGE_EDIT_WAIT)
+    if not task.done():
+        if ephemeral:
+            await diagnostics.defer(interaction, ephemeral=True, thinking=True)
         else:
-            # Show individual country prices
-            embed.add_field(name="Base Cost", value=format_price_with_hours(base_cost), inline=True)
-            embed.add_field(name="US Price", value=format_price_with_hours(ticket_cost.get('us')), inline=True)
-            embed.add_field(name="EU Price", value=format_price_with_hours(ticket_cost.get('eu')), inline=True)
-            embed.add_field(name="UK Price", value=format_price_with_hours(ticket_cost.get('uk')), inline=True)
-            embed.add_field(name="CA Price", value=format_price_with_hours(ticket_cost.get('ca')), inline=True)
-        
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-
-    @ui.button(label="📦 Availability", style=discord.ButtonStyle.primary)
-    async def avail_button(self, interaction: discord.Interaction, button: ui.Button):
-        # Show availability
-        enabled = self.item.get("enabled", {})
-        embed = discord.Embed(title=f"📦 {self.item['name']} - Availability", color=discord.Color.green())
-        embed.add_field(name="🇺🇸 United States", value="✅" if enabled.get("enabled_us") else "❌", inline=True)
-        embed.add_field(name="🇪🇺 Europe", value="✅" if enabled.get("enabled_eu") else "❌", inline=True)
-        embed.add_field(name="🇬🇧 UK", value="✅" if enabled.get("enabled_uk") else "❌", inline=True)
-        embed.add_field(name="🇨🇦 Canada", value="✅" if enabled.get("enabled_ca") else "❌", inline=True)
-        embed.add_field(name="🇦🇺 Australia", value="✅" if enabled.get("enabled_au") else "❌", inline=True)
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-
-
-class StorePaginationView(ui.View):
-    # Pagination view for store items
-    def __init__(self, items_by_type, current_page: int = 0, items_per_page: int = 5):
-        super().__init__(timeout=180)
-        self.items_by_type = items_by_type
-        self.current_page = current_page
-        self.items_per_page = items_per_page
-        self.item_page = 0  # Current page within the category
-        self.types = list(items_by_type.keys())
-        
-        self.update_buttons()
-
-    def update_buttons(self):
-        # Enable/disable buttons based on current page
-        current_items = self.items_by_type[self.types[self.current_page]]
-        total_item_pages = (len(current_items) - 1) // self.items_per_page
-        
-        self.prev_button.disabled = self.current_page == 0 and self.item_page == 0
-        self.next_button.disabled = self.current_page == len(self.types) - 1 and self.item_page == total_item_pages
-
-    def get_current_embed(self):
-        # Get embed for current page
-        item_type = self.types[self.current_page]
-        type_items = self.items_by_type[item_type]
-        
-        # Calculate pagination for items within this category
-        start_idx = self.item_page * self.items_per_page
-        end_idx = start_idx + self.items_per_page
-        page_items = type_items[start_idx:end_idx]
-        
-        total_item_pages = (len(type_items) - 1) // self.items_per_page + 1
-        
-        embed = discord.Embed(
-            title=f"🛍️ Store Items - {item_type.title()}",
-            color=discord.Color.gold(),
-            description=f"Found {len(type_items)} {item_type.lower()} item{'s' if len(type_items) != 1 else ''}"
-        )
+            await diagnostics.defer(interaction)
+    return await task
+
+
+# Buttons: every button carries its state in its custom_id and is answered by route_component,
+# so no View object stays in memory after sending and buttons survive restarts
+
+def button_row(name: str, *buttons: ui.Button) -> ui.View:
+    """A send-only view: stopped so discord.py does not keep it around to dispatch clicks"""
+    view = ui.View(timeout=None)
+    for button in buttons:
+        view.add_item(button)
+    view.stop()
+    metrics.track_view(name)
+    return view
+
+
+def project_buttons(project) -> ui.View:
+    """Action buttons for project details"""
+    project_id = project["id"]
+    return button_row(
+        "project",
+        ui.Button(label="📚 Repository", style=discord.ButtonStyle.green, emoji="🔗",
+                  custom_id=custom_ids.make("project", project_id, "repo"), disabled=not project.get("repo_url")),
+        ui.Button(label="🎯 Live Demo", style=discord.ButtonStyle.green, emoji="🌐",
+                  custom_id=custom_ids.make("project", project_id, "demo"), disabled=not project.get("demo_url")),
+        ui.Button(label="📖 View Full Details", style=discord.ButtonStyle.primary,
+                  custom_id=custom_ids.make("project", project_id, "details")),
+    )
+
+
+def user_buttons(user) -> ui.View:
+    """Action buttons for user details"""
+    return button_row(
+        "user",
+        ui.Button(label="📊 Stats", style=discord.ButtonStyle.primary, emoji="📈",
+                  custom_id=custom_ids.make("user", user["id"], "stats")),
+        ui.Button(label="🔗 Slack ID", style=discord.ButtonStyle.blurple,
+                  custom_id=custom_ids.make("user", user["id"], "slack")),
+    )
+
+
+def store_item_buttons(item) -> ui.View:
+    """Action buttons for store items"""
+    return button_row(
+        "store_item",
+        ui.Button(label="💰 Price Info", style=discord.ButtonStyle.success, emoji="💵",
+                  custom_id=custom_ids.make("item", item["id"], "price")),
+        ui.Button(label="📦 Availability", style=discord.ButtonStyle.primary,
+                  custom_id=custom_ids.make("item", item["id"], "availability")),
+    )
+
+
+def pagination_buttons(listing: str, query_key: str, page: int, total_pages: int) -> ui.View:
+    """Navigation buttons for a paginated listing; each one names the page it goes to.
+    The trailing slot keeps custom_ids unique when two buttons point at the same page."""
+    def button(label, target, slot, disabled):
+        return ui.Button(label=label, style=discord.ButtonStyle.blurple, disabled=disabled,
+                         custom_id=custom_ids.make("page", listing, query_key, target, slot))
+
+    return button_row(
+        "pagination",
+        button("⏮️ First", 1, "f", page <= 1),
+        button("◀️ Previous", max(1, page - 1), "p", page <= 1),
+        button("Next ▶️", min(total_pages, page + 1), "n", page >= total_pages),
+        button("Last ⏭️", total_pages, "l", page >= total_pages),
+    )
+
+
+def store_buttons(page: int, total_pages: int) -> ui.View:
+    """Navigation buttons over the pre-rendered pages of the store catalog"""
+    return button_row(
+        "store",
+        ui.Button(label="<--", style=discord.ButtonStyle.primary, disabled=page == 0,
+                  custom_id=custom_ids.make("store", max(0, page - 1), "p")),
+        ui.Button(label="-->", style=discord.ButtonStyle.primary, disabled=page >= total_pages - 1,
+                  custom_id=custom_ids.make("store", min(total_pages - 1, page + 1), "n")),
+    )
+
+
+# Paginated listings
+
+async def fetch_projects_page(query, page: int):
+    if search_index.is_fresh("project"):
+        return search_index.search("project", query, page)
+    result = await api.get_projects(page=page, query=query)
+    index_records("project", result.get("projects", []))
+    return result
+
+
+async def fetch_users_page(query, page: int):
+    if search_index.is_fresh("user"):
+        return search_index.search("user", query, page)
+    result = await api.get_users(page=page, query=query)
+    index_records("user", result.get("users", []))
+    return result
+
+
+async def fetch_recent_devlogs_page(query, page: int):
+    result = await api.get_devlogs(page=page)
+    index_records("devlog", result.get("devlogs", []))
+    return result
+
+
+async def fetch_devlog_search_page(query, page: int):
+    # The API has no devlog search, so this always reads the local index
+    return search_index.search("devlog", query, page)
+
+
+def build_devlog_search_embed(result):
+    embed = embeds.devlogs_page_embed(result, "Devlog Search Results")
+    if embed is not None and not search_index.is_fresh("devlog"):
+        count, _ = search_index.freshness("devlog")
+        embed.set_footer(text=f"{embed.footer.text} | Partial index ({count} devlogs)")
+    return embed
+
+
+# Listing name (used in custom_ids) -> (fetch_page(query, page), build_embed(result), empty message)
+LISTINGS = {
+    "projects": (fetch_projects_page, embeds.projects_page_embed, "No projects found."),
+    "users": (fetch_users_page, embeds.users_page_embed, "No users found."),
+    "devlogs": (fetch_recent_devlogs_page, lambda result: embeds.devlogs_page_embed(result, "Recent Devlogs"), "No devlogs found."),
+    "devlog_search": (fetch_devlog_search_page, build_devlog_search_embed, "No matching devlogs found."),
+}
+
+# (listing, query key, page) -> (started at, task fetching that page), shared by every message
+page_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+
+def load_page(listing: str, query_key: str, query, page: int) -> asyncio.Task:
+    """Return the (possibly already running) task fetching a listing page, starting one if needed"""
+    key = (listing, query_key, page)
+    entry = page_cache.get(key)
+    if entry is not None:
+        started_at, task = entry
+        failed = task.cancelled() or (task.done() and task.exception() is not None)
+        if not failed and time.monotonic() - started_at < PAGE_CACHE_TTL:
+            page_cache.move_to_end(key)
+            return task
+    fetch_page = LISTINGS[listing][0]
+    task = asyncio.create_task(fetch_page(query, page))
+    # Prefetches nobody awaits should not log "exception was never retrieved"
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    page_cache[key] = (time.monotonic(), task)
+    page_cache.move_to_end(key)
+    while len(page_cache) > PAGE_CACHE_MAX:
+        # Evicted fetches keep running for anyone already waiting on them
+        page_cache.popitem(last=False)
+    return task
+
+
+def prefetch_adjacent(listing: str, query_key: str, query, page: int, total_pages: int):
+    """Fetch the neighbouring pages in the background while the rate limit has room"""
+    if api.rate_limiter.pending or api.rate_limiter.tokens < PREFETCH_MIN_TOKENS:
+        return
+    with background_priority():
+        for neighbour in (page + 1, page - 1):
+            if 1 <= neighbour <= total_pages:
+                load_page(listing, query_key, query, neighbour)
+
+
+async def render_paginated(interaction: discord.Interaction, listing: str, query, page: int):
+    """Send the first page of a paginated listing; its buttons then edit the message in place"""
+    _, build_embed, empty_message = LISTINGS[listing]
+    query_key = datastore.save_query(query) if query is not None else NO_QUERY
+    try:
+        result = await load_page(listing, query_key, query, page)
+    except ValueError as e:
+        await send_and_schedule_delete(interaction, content=f"Error: {e}")
+        return
+
+    pagination = result.get("pagination", {})
+    with diagnostics.span("render"):
+        embed = build_embed(result)
+    if embed is None:
+        await send_and_schedule_delete(interaction, content=empty_message)
+        return
+
+    page = pagination.get('current_page', page)
+    total_pages = pagination.get('total_pages', 1)
+    await send_and_schedule_delete(interaction, embed=embed, view=pagination_buttons(listing, query_key, page, total_pages))
+    prefetch_adjacent(listing, query_key, query, page, total_pages)
+
+
+# Button click handlers, routed by the first part of the custom_id
+
+async def load_entity(kind: str, entity_id: int):
+    """Entity for a button click: the store snapshot, the API (through its cache), then the local store"""
+    if kind == "store_item" and store_catalog.snapshot is not None:
+        item = store_catalog.snapshot.items_by_id.get(entity_id)
+        if item is not None:
+            return item
+    getter = {"project": api.get_project, "user": api.get_user, "store_item": api.get_store_item}[kind]
+    try:
+        return await getter(entity_id)
+    except ValueError:
+        record = datastore.get(kind, entity_id)
+        if record is None:
+            raise
+        return record
+
+
+async def on_project_button(interaction: discord.Interaction, project_id: str, action: str):
+    project = await wait_or_defer(interaction, asyncio.ensure_future(load_entity("project", int(project_id))), ephemeral=True)
+    if action == "repo":
+        await send_notice(interaction, f"Repository: {project.get('repo_url') or 'Not available'}")
+    elif action == "demo":
+        await send_notice(interaction, f"Live Demo: {project.get('demo_url') or 'Not available'}")
+    else:
+        await send_notice(interaction, embed=embeds.project_details_embed(project))
 
-        for item in page_items:
-            stock = item.get("stock", "Unknown")
-            limited = "🔴 Limited" if item.get("limited") else "🟢 Available"
-            embed.add_field(
-                name=f"{item['name']} (ID: {item['id']})",
-                value=f"{limited} | Stock: {stock}",
-                inline=False,
-            )
-
-        embed.set_footer(text=f"Category {self.current_page + 1} of {len(self.types)} | Items {self.item_page + 1} of {total_item_pages}")
-        return embed
-
-    @ui.button(label="<--", style=discord.ButtonStyle.primary)
-    async def prev_button(self, interaction: discord.Interaction, button: ui.Button):
-        # Go to previous page (either previous category or previous items in current category)
-        current_items = self.items_by_type[self.types[self.current_page]]
-        total_item_pages = (len(current_items) - 1) // self.items_per_page
-        
-        if self.item_page > 0:
-            # Go to previous items page in current category
-            self.item_page -= 1
-        elif self.current_page > 0:
-            # Go to previous category and last items page
-            self.current_page -= 1
-            prev_items = self.items_by_type[self.types[self.current_page]]
-            self.item_page = (len(prev_items) - 1) // self.items_per_page
-        
-        self.update_buttons()
-        embed = self.get_current_embed()
-        await interaction.response.edit_message(embed=embed, view=self)
-
-    @ui.button(label="-->", style=discord.ButtonStyle.primary)
-    async def next_button(self, interaction: discord.Interaction, button: ui.Button):
-        # Go to next page (either next items in current category or next category)
-        current_items = self.items_by_type[self.types[self.current_page]]
-        total_item_pages = (len(current_items) - 1) // self.items_per_page
-        
-        if self.item_page < total_item_pages:
-            # Go to next items page in current category
-            self.item_page += 1
-        elif self.current_page < len(self.types) - 1:
-            # Go to next category and first items page
-            self.current_page += 1
-            self.item_page = 0
-        
-        self.update_buttons()
-        embed = self.get_current_embed()
-        await interaction.response.edit_message(embed=embed, view=self)
+
+async def on_user_button(interaction: discord.Interaction, user_id: str, action: str):
+    user = await wait_or_defer(interaction, asyncio.ensure_future(load_entity("user", int(user_id))), ephemeral=True)
+    if action == "slack":
+        await send_notice(interaction, f"Slack ID: `{user.get('slack_id', 'Not linked')}`")
+    else:
+        await send_notice(interaction, embed=embeds.user_stats_embed(user))
+
+
+async def on_store_item_button(interaction: discord.Interaction, item_id: str, action: str):
+    item = await wait_or_defer(interaction, asyncio.ensure_future(load_entity("store_item", int(item_id))), ephemeral=True)
+    if action == "price":
+        await send_notice(interaction, embed=embeds.store_item_price_embed(item))
+    else:
+        await send_notice(interaction, embed=embeds.store_item_availability_embed(item))
+
+
+async def on_page_button(interaction: discord.Interaction, listing: str, query_key: str, page: str, slot: str):
+    # Edit the message in place to show another page
+    if listing not in LISTINGS:
+        return
+    query = datastore.get_query(query_key) if query_key != NO_QUERY else None
+    if query_key != NO_QUERY and query is None:
+        await send_notice(interaction, "This search has expired, please run the command again.")
+        return
+    _, build_embed, empty_message = LISTINGS[listing]
+    page = int(page)
+    result = await wait_or_defer(interaction, load_page(listing, query_key, query, page))
+    embed = build_embed(result)
+    if embed is None:
+        await send_notice(interaction, empty_message)
+        return
+
+    pagination = result.get("pagination", {})
+    page = pagination.get('current_page', page)
+    total_pages = pagination.get('total_pages', page)
+    view = pagination_buttons(listing, query_key, page, total_pages)
+    if interaction.response.is_done():
+        await interaction.edit_original_response(embed=embed, view=view)
+    else:
+        await interaction.response.edit_message(embed=embed, view=view)
+    prefetch_adjacent(listing, query_key, query, page, total_pages)
+
+
+async def on_store_button(interaction: discord.Interaction, page: str, slot: str):
+    # Show another page of the current catalog snapshot (fetched first if there is none yet)
+    snapshot = await wait_or_defer(interaction, asyncio.ensure_future(store_catalog.get_snapshot()))
+    if not snapshot.pages:
+        await send_notice(interaction, "No store items found.")
+        return
+    page = min(int(page), len(snapshot.pages) - 1)
+    embed, view = snapshot.pages[page], store_buttons(page, len(snapshot.pages))
+    if interaction.response.is_done():
+        await interaction.edit_original_response(embed=embed, view=view)
+    else:
+        await interaction.response.edit_message(embed=embed, view=view)
+
+
+# custom_id action -> (handler, number of arguments after the action)
+COMPONENT_HANDLERS = {
+    "project": (on_project_button, 2),
+    "user": (on_user_button, 2),
+    "item": (on_store_item_button, 2),
+    "page": (on_page_button, 4),
+    "store": (on_store_button, 2),
+}
+
+
+@bot.listen("on_interaction")
+async def route_component(interaction: discord.Interaction):
+    # One handler for every button we send
+    if interaction.type != discord.InteractionType.component:
+        return
+    parts = custom_ids.parse((interaction.data or {}).get("custom_id"))
+    if not parts or parts[0] not in COMPONENT_HANDLERS:
+        return
+    handler, arg_count = COMPONENT_HANDLERS[parts[0]]
+    if len(parts) - 1 != arg_count:
+        # A button from an older release
+        await send_notice(interaction, "This button is no longer supported, please run the command again.")
+        return
+    metrics.track_component(parts[0])
+    try:
+        await handler(interaction, *parts[1:])
+    except ValueError as e:
+        await send_notice(interaction, f"Error: {e}")
+
+
+@bot.event
+async def on_app_command_completion(interaction: discord.Interaction, command):
+    metrics.command_finished(interaction, "ok")
+    diagnostics.finish_trace(interaction, "ok")
 
 
 @bot.event
 async def on_ready():
     print(f"{bot.user} has connected to Discord!")
-    try:
-        synced = await bot.tree.sync()
-        print(f"Synced {len(synced)} command(s)")
-    except Exception as e:
-        print(f"Failed to sync commands: {e}")
 
 
-@bot.tree.command(name="project", description="Get a project by ID")
-async def get_project(interaction: discord.Interaction, project_id: int):
-    # Fetch a specific project
-    await interaction.response.defer()
+@bot.tree.command(name="project", description="Get a project by ID, or several at once")
+@app_commands.describe(project_id="Project to show", ids=f"Up to {MAX_BULK_IDS} project IDs, e.g. 12,34,56")
+async def get_project(interaction: discord.Interaction, project_id: Optional[int] = None, ids: Optional[str] = None):
+    # Fetch a specific project, or several with one reply
+    if ids is not None or project_id is None:
+        await send_bulk(interaction, "project", project_id, ids, api.get_projects_bulk, embeds.project_embed)
+        return
+    await diagnostics.defer(interaction)
     try:
         project = await api.get_project(project_id)
-        embed = discord.Embed(title=project["title"], description=project["description"], color=discord.Color.blue())
-        embed.add_field(name="ID", value=str(project["id"]), inline=True)
-        embed.add_field(name="Status", value=project.get("ship_status", "N/A"), inline=True)
-        if project.get("repo_url"):
-            embed.add_field(name="Repository", value=f"[Link]({project['repo_url']})", inline=False)
-        if project.get("demo_url"):
-            embed.add_field(name="Demo", value=f"[Link]({project['demo_url']})", inline=False)
-        embed.set_footer(text=f"Created: {project['created_at']}")
-        await send_and_schedule_delete(interaction, embed=embed, view=ProjectView(project))
+        index_records("project", [project])
+        embed = embeds.project_embed(project)
+        await send_and_schedule_delete(interaction, embed=embed, view=project_buttons(project))
     except ValueError as e:
         await send_and_schedule_delete(interaction, content=f"Error: {e}")
 
 
+@get_project.autocomplete("project_id")
+async def project_id_autocomplete(interaction: discord.Interaction, current: str):
+    return autocomplete_choices("project", current)
+
+
 @bot.tree.command(name="projects", description="Search for projects")
 async def search_projects(interaction: discord.Interaction, query: str, page: int = 1):
     # Search for projects
-    await interaction.response.defer()
-    
-    async def render_projects(inter: discord.Interaction, p: int):
-        try:
-            result = await api.get_projects(page=p, query=query)
-            projects = result.get("projects", [])
-            pagination = result.get("pagination", {})
-
-            if not projects:
-                await send_and_schedule_delete(inter, content="No projects found.")
-                return
-
-            embed = discord.Embed(
-                title=f"Projects Search Results",
-                description=f"Found {pagination.get('total_count', 0)} projects",
-                color=discord.Color.green(),
-            )
-
-            for project in projects[:5]:  # Show first 5 results
-                embed.add_field(
-                    name=project["title"],
-                    value=f"{project['description'][:100]}...",
-                    inline=False,
-                )
-
-            embed.set_footer(
-                text=f"Page {pagination.get('current_page', 1)} of {pagination.get('total_pages', 1)}"
-            )
-            view = PaginationView(pagination.get('current_page', 1), pagination.get('total_pages', 1), render_projects)
-            await send_and_schedule_delete(inter, embed=embed, view=view)
-        except ValueError as e:
-            await send_and_schedule_delete(inter, content=f"Error: {e}")
-    
-    await render_projects(interaction, page)
+    await diagnostics.defer(interaction)
+    await render_paginated(interaction, "projects", query, page)
 
 
 @bot.tree.command(name="devlog", description="Get a devlog by ID")
 async def get_devlog(interaction: discord.Interaction, devlog_id: int):
     # Fetch a specific devlog
-    await interaction.response.defer()
+    await diagnostics.defer(interaction)
     try:
         devlog = await api.get_devlog(devlog_id)
-        embed = discord.Embed(
-            title=f"Devlog #{devlog_id}",
-            description=devlog["body"][:300] + "..." if len(devlog["body"]) > 300 else devlog["body"],
-            color=discord.Color.purple(),
-        )
-        embed.add_field(name="Comments", value=str(devlog.get("comments_count", 0)), inline=True)
-        embed.add_field(name="Likes", value=str(devlog.get("likes_count", 0)), inline=True)
-        embed.add_field(
-            name="Duration", value=f"{devlog.get('duration_seconds', 0)}s", inline=True
-        )
-        if devlog.get("scrapbook_url"):
-            embed.add_field(name="Scrapbook", value=f"[Link]({devlog['scrapbook_url']})", inline=False)
-        embed.set_footer(text=f"Created: {devlog['created_at']}")
+        index_records("devlog", [devlog])
+        embed = embeds.devlog_embed(devlog)
         await send_and_schedule_delete(interaction, embed=embed)
     except ValueError as e:
         await send_and_schedule_delete(interaction, content=f"Error: {e}")
 
 
-@bot.tree.command(name="user", description="Get user info by ID")
-async def get_user(interaction: discord.Interaction, user_id: int):
-    # Fetch a specific user
-    await interaction.response.defer()
+@get_devlog.autocomplete("devlog_id")
+async def devlog_id_autocomplete(interaction: discord.Interaction, current: str):
+    return autocomplete_choices("devlog", current)
+
+
+@bot.tree.command(name="user", description="Get user info by ID, or several users at once")
+@app_commands.describe(user_id="User to show", ids=f"Up to {MAX_BULK_IDS} user IDs, e.g. 12,34,56")
+async def get_user(interaction: discord.Interaction, user_id: Optional[int] = None, ids: Optional[str] = None):
+    # Fetch a specific user, or several with one reply
+    if ids is not None or user_id is None:
+        await send_bulk(interaction, "user", user_id, ids, api.get_users_bulk, embeds.user_embed)
+        return
+    await diagnostics.defer(interaction)
     try:
         user = await api.get_user(user_id)
-        embed = discord.Embed(title=user["display_name"], color=discord.Color.orange())
-        embed.add_field(name="ID", value=str(user["id"]), inline=True)
-        if user.get("slack_id"):
-            embed.add_field(name="Slack ID", value=user["slack_id"], inline=True)
-        embed.add_field(name="Votes", value=str(user.get("vote_count", 0)), inline=True)
-        embed.add_field(name="Likes", value=str(user.get("like_count", 0)), inline=True)
-        embed.add_field(
-            name="Devlog Time (Today)", value=f"{user.get('devlog_seconds_today', 0)}s", inline=True
-        )
-        embed.add_field(
-            name="Devlog Time (Total)", value=f"{user.get('devlog_seconds_total', 0)}s", inline=True
-        )
-        if user.get("avatar"):
-            embed.set_thumbnail(url=user["avatar"])
-        await send_and_schedule_delete(interaction, embed=embed, view=UserView(user))
+        index_records("user", [user])
+        embed = embeds.user_embed(user)
+        await send_and_schedule_delete(interaction, embed=embed, view=user_buttons(user))
     except ValueError as e:
         await send_and_schedule_delete(interaction, content=f"Error: {e}")
 
 
+@get_user.autocomplete("user_id")
+async def user_id_autocomplete(interaction: discord.Interaction, current: str):
+    return autocomplete_choices("user", current)
+
+
 @bot.tree.command(name="users", description="Search for users")
 async def search_users(interaction: discord.Interaction, query: str, page: int = 1):
     # Search for users
-    await interaction.response.defer()
-    
-    async def render_users(inter: discord.Interaction, p: int):
-        try:
-            result = await api.get_users(page=p, query=query)
-            users = result.get("users", [])
-            pagination = result.get("pagination", {})
-
-            if not users:
-                await send_and_schedule_delete(inter, content="No users found.")
-                return
-
-            embed = discord.Embed(
-                title=f"User Search Results",
-                description=f"Found {pagination.get('total_count', 0)} users",
-                color=discord.Color.yellow(),
-            )
-
-            for user in users[:5]:  # Show first 5 results
-                embed.add_field(
-                    name=user["display_name"],
-                    value=f"Slack: {user.get('slack_id', 'N/A')} | Cookies: {user.get('cookies', 0)}",
-                    inline=False,
-                )
-
-            embed.set_footer(
-                text=f"Page {pagination.get('current_page', 1)} of {pagination.get('total_pages', 1)}"
-            )
-            view = PaginationView(pagination.get('current_page', 1), pagination.get('total_pages', 1), render_users)
-            await send_and_schedule_delete(inter, embed=embed, view=view)
-        except ValueError as e:
-            await send_and_schedule_delete(inter, content=f"Error: {e}")
-    
-    await render_users(interaction, page)
+    await diagnostics.defer(interaction)
+    await render_paginated(interaction, "users", query, page)
 
 
 @bot.tree.command(name="store", description="Get store items")
 async def get_store(interaction: discord.Interaction):
     # Fetch store items
-    await interaction.response.defer()
+    await diagnostics.defer(interaction)
     try:
-        items = await api.get_store_items()
+        snapshot = await store_catalog.get_snapshot()
 
-        if not items:
+        if not snapshot.pages:
             await send_and_schedule_delete(interaction, content="No store items found.")
             return
 
-        # Group items by type and sort by price
-        items_by_type = {}
-        for item in items:
-            item_type = item.get("type", "Other")
-            if item_type not in items_by_type:
-                items_by_type[item_type] = []
-            items_by_type[item_type].append(item)
-
-        # Sort items within each type by base cost (ascending)
-        for item_type in items_by_type:
-            items_by_type[item_type].sort(key=lambda x: x.get("ticket_cost", {}).get("base_cost", float('inf')))
-
-        # Create pagination view
-        view = StorePaginationView(items_by_type)
-        embed = view.get_current_embed()
-        
-        await send_and_schedule_delete(interaction, embed=embed, view=view)
+        # Serve the pre-rendered catalog pages
+        await send_and_schedule_delete(interaction, embed=snapshot.pages[0], view=store_buttons(0, len(snapshot.pages)))
 
     except ValueError as e:
         await send_and_schedule_delete(interaction, content=f"Error: {e}")
@@ -497,66 +758,197 @@ async def get_store(interaction: discord.Interaction):
 @bot.tree.command(name="store_item", description="Get a store item by ID")
 async def get_store_item(interaction: discord.Interaction, item_id: int):
     # Fetch a specific store item
-    await interaction.response.defer()
+    await diagnostics.defer(interaction)
     try:
-        item = await api.get_store_item(item_id)
-        embed = discord.Embed(title=item["name"], description=item.get("description", ""), color=discord.Color.blurple())
-        embed.add_field(name="Type", value=item.get("type", "N/A"), inline=True)
-        embed.add_field(name="Stock", value=str(item.get("stock", 0)), inline=True)
-        embed.add_field(name="Limited", value="Yes" if item.get("limited") else "No", inline=True)
-        
-        if item.get("image_url"):
-            embed.set_image(url=item["image_url"])
-        
-        embed.set_footer(text=f"Item ID: {item['id']}")
-        await send_and_schedule_delete(interaction, embed=embed, view=StoreItemView(item))
+        snapshot = await store_catalog.get_snapshot()
+        item = snapshot.items_by_id.get(item_id)
+        if item is None:
+            # Not in the catalog snapshot yet (e.g. added since the last refresh)
+            item = await api.get_store_item(item_id)
+            index_records("store_item", [item])
+        embed = embeds.store_item_embed(item)
+        await send_and_schedule_delete(interaction, embed=embed, view=store_item_buttons(item))
     except ValueError as e:
         await send_and_schedule_delete(interaction, content=f"Error: {e}")
 
 
-@bot.tree.command(name="devlogs", description="Get recent devlogs")
+@get_store_item.autocomplete("item_id")
+async def item_id_autocomplete(interaction: discord.Interaction, current: str):
+    return autocomplete_choices("store_item", current)
+
+
+store_watch_group = app_commands.Group(name="store_watch", description="Get notified about store restocks and price changes")
+
+
+def watch_target(interaction: discord.Interaction, dm: bool):
+    """Where store updates for this interaction should go"""
+    if dm or interaction.guild is None:
+        return "user", interaction.user.id
+    return "channel", interaction.channel_id
+
+
+async def check_watch_args(interaction: discord.Interaction, target_type: str, item_id, item_type):
+    """Validate /store_watch arguments, replying with an error if they are unusable"""
+    if (item_id is None) == (item_type is None):
+        await interaction.response.send_message("Pick either an item or an item type.", ephemeral=True)
+        return False
+    if target_type == "channel" and not interaction.permissions.manage_channels:
+        await interaction.response.send_message(
+            "You need the Manage Channels permission to set up channel updates. Use `dm: True` to get them in your DMs.",
+            ephemeral=True,
+        )
+        return False
+    return True
+
+
+@store_watch_group.command(name="add", description="Watch a store item or item type for stock and price changes")
+@app_commands.describe(item_id="Store item to watch", item_type="Item type to watch", dm="Send updates to your DMs instead of this channel")
+async def store_watch_add(interaction: discord.Interaction, item_id: Optional[int] = None, item_type: Optional[str] = None, dm: bool = False):
+    # Subscribe this channel (or the user) to store changes
+    target_type, target_id = watch_target(interaction, dm)
+    if not await check_watch_args(interaction, target_type, item_id, item_type):
+        return
+    scope, value = ("item", str(item_id)) if item_id is not None else ("type", item_type)
+    if store_feed.subscribe(target_type, target_id, scope, value):
+        where = "your DMs" if target_type == "user" else "this channel"
+        await interaction.response.send_message(f"Watching {scope} `{value}`. Updates will be sent to {where}.", ephemeral=True)
+    else:
+        await interaction.response.send_message("Too many subscriptions here. Remove some with `/store_watch remove` first.", ephemeral=True)
+
+
+@store_watch_group.command(name="remove", description="Stop watching a store item or item type")
+@app_commands.describe(item_id="Store item to stop watching", item_type="Item type to stop watching", dm="Remove a DM subscription instead of a channel one")
+async def store_watch_remove(interaction: discord.Interaction, item_id: Optional[int] = None, item_type: Optional[str] = None, dm: bool = False):
+    # Unsubscribe this channel (or the user) from store changes
+    target_type, target_id = watch_target(interaction, dm)
+    if not await check_watch_args(interaction, target_type, item_id, item_type):
+        return
+    scope, value = ("item", str(item_id)) if item_id is not None else ("type", item_type)
+    if store_feed.unsubscribe(target_type, target_id, scope, value):
+        await interaction.response.send_message(f"Stopped watching {scope} `{value}`.", ephemeral=True)
+    else:
+        await interaction.response.send_message(f"Not watching {scope} `{value}`.", ephemeral=True)
+
+
+@store_watch_group.command(name="list", description="List store subscriptions")
+@app_commands.describe(dm="List your DM subscriptions instead of this channel's")
+async def store_watch_list(interaction: discord.Interaction, dm: bool = False):
+    # Show what this channel (or the user) is watching
+    target_type, target_id = watch_target(interaction, dm)
+    subscriptions = store_feed.subscriptions(target_type, target_id)
+    if not subscriptions:
+        await interaction.response.send_message("No store subscriptions.", ephemeral=True)
+        return
+    lines = [f"• {scope} `{value}`" for scope, value in subscriptions]
+    await interaction.response.send_message("Watching:\n" + "\n".join(lines), ephemeral=True)
+
+
+@store_watch_add.autocomplete("item_id")
+@store_watch_remove.autocomplete("item_id")
+async def store_watch_item_autocomplete(interaction: discord.Interaction, current: str):
+    return autocomplete_choices("store_item", current)
+
+
+@store_watch_add.autocomplete("item_type")
+@store_watch_remove.autocomplete("item_type")
+async def store_watch_type_autocomplete(interaction: discord.Interaction, current: str):
+    snapshot = store_catalog.snapshot
+    types = list(snapshot.items_by_type) if snapshot is not None else []
+    return [
+        app_commands.Choice(name=item_type, value=item_type)
+        for item_type in types if item_type.lower().startswith(current.lower())
+    ][:25]
+
+
+bot.tree.add_command(store_watch_group)
+
+
+@bot.tree.command(name="leaderboard", description="Top users by cookies, votes, likes or devlog time")
+@app_commands.describe(metric="What to rank users by", limit="How many users to show")
+@app_commands.choices(metric=[
+    app_commands.Choice(name=title, value=metric) for metric, title in LEADERBOARD_METRICS.items()
+])
+async def show_leaderboard(
+    interaction: discord.Interaction, metric: app_commands.Choice[str], limit: app_commands.Range[int, 1, TOP_K] = 10
+):
+    # Served from the in-memory leaderboards, never from the API
+    # Deferring first makes the reply a followup message, which can be scheduled for deletion
+    await diagnostics.defer(interaction)
+    rows = leaderboards.top(metric.value, limit)
+    if not rows:
+        await send_and_schedule_delete(interaction, content="No users synced yet, try again later.")
+        return
+    embed = embeds.leaderboard_embed(metric.name, metric.value, rows, leaderboards.recomputed_at)
+    await send_and_schedule_delete(interaction, embed=embed)
+
+
+@bot.tree.command(name="shards", description="Show gateway latency and event rates per shard")
+async def show_shards(interaction: discord.Interaction):
+    # Report per-shard gateway health for this process
+    embed = discord.Embed(title=f"Shards ({PROCESS_NAME})", color=discord.Color.blurple())
+    for row in shard_metrics.snapshot():
+        latency = f"{row['latency'] * 1000:.0f} ms" if math.isfinite(row['latency']) else "N/A"
+        embed.add_field(
+            name=f"Shard {row['shard_id']}",
+            value=(
+                f"Latency: {latency}\n"
+                f"Events: {row['events']} ({row['event_rate']:.1f}/s)\n"
+                f"Connects: {row['connects']} | Disconnects: {row['disconnects']} | Resumes: {row['resumes']}"
+            ),
+            inline=False,
+        )
+    embed.set_footer(text=f"Total shards: {bot.shard_count or 1}")
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+devlogs_group = app_commands.Group(name="devlogs", description="Browse and search devlogs")
+
+
+@devlogs_group.command(name="recent", description="Get recent devlogs")
 async def get_devlogs(interaction: discord.Interaction, page: int = 1):
     # Fetch recent devlogs
-    await interaction.response.defer()
-    
-    async def render_devlogs(inter: discord.Interaction, p: int):
-        try:
-            result = await api.get_devlogs(page=p)
-            devlogs = result.get("devlogs", [])
-            pagination = result.get("pagination", {})
-
-            if not devlogs:
-                await send_and_schedule_delete(inter, content="No devlogs found.")
-                return
-
-            embed = discord.Embed(
-                title="Recent Devlogs",
-                description=f"Total: {pagination.get('total_count', 0)}",
-                color=discord.Color.green(),
-            )
-
-            for devlog in devlogs[:5]:  # Show first 5
-                embed.add_field(
-                    name=f"Devlog #{devlog['id']}",
-                    value=f"{devlog['body'][:80]}... | 💬 {devlog.get('comments_count', 0)} | ❤️ {devlog.get('likes_count', 0)}",
-                    inline=False,
-                )
-
-            embed.set_footer(
-                text=f"Page {pagination.get('current_page', 1)} of {pagination.get('total_pages', 1)}"
-            )
-            view = PaginationView(pagination.get('current_page', 1), pagination.get('total_pages', 1), render_devlogs)
-            await send_and_schedule_delete(inter, embed=embed, view=view)
-        except ValueError as e:
-            await send_and_schedule_delete(inter, content=f"Error: {e}")
-    
-    await render_devlogs(interaction, page)
+    await diagnostics.defer(interaction)
+    await render_paginated(interaction, "devlogs", None, page)
+
+
+@devlogs_group.command(name="search", description="Search devlogs")
+async def search_devlogs(interaction: discord.Interaction, query: str, page: int = 1):
+    # Search devlogs in the local index (the API has no devlog search)
+    await diagnostics.defer(interaction)
+    await render_paginated(interaction, "devlog_search", query, page)
+
+
+bot.tree.add_command(devlogs_group)
+
+stats_group = app_commands.Group(name="stats", description="Activity statistics from synced data")
+STATS_WINDOW_TITLES = {"7d": "Last 7 days", "30d": "Last 30 days", "90d": "Last 90 days", "all": "All time"}
+
+
+@stats_group.command(name="devlogs", description="Devlogs per day, time spent, likes and comments")
+@app_commands.describe(window="Time window to aggregate over")
+@app_commands.choices(window=[
+    app_commands.Choice(name=STATS_WINDOW_TITLES[window], value=window) for window in STATS_WINDOWS
+])
+async def devlog_stats(interaction: discord.Interaction, window: Optional[app_commands.Choice[str]] = None):
+    # Aggregated from the in-memory devlog columns, never from the API
+    await diagnostics.defer(interaction)
+    window_key = window.value if window else "30d"
+    if not len(devlog_analytics.columns):
+        await send_and_schedule_delete(interaction, content="No devlogs synced yet, try again later.")
+        return
+    with diagnostics.span("stats", window=window_key):
+        stats = devlog_analytics.stats(window_key)
+    embed = embeds.devlog_stats_embed(STATS_WINDOW_TITLES[window_key], stats, MAX_DAILY_BARS)
+    await send_and_schedule_delete(interaction, embed=embed)
+
+
+bot.tree.add_command(stats_group)
 
 
 def main():
     if not DISCORD_TOKEN:
         raise ValueError("DISCORD_TOKEN not found in .env file")
-    if not FLAVORTOWN_API_KEY:
+    if not FLAVORTOWN_API_KEY and not (FLAVORTOWN_GATEWAY_URL or FLAVORTOWN_GATEWAY_SOCKET):
         raise ValueError("FLAVORTOWN_API_KEY not found in .env file")
 
     bot.run(DISCORD_TOKEN)
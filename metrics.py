@@ -0,0 +1,302 @@
+import asyncio
+import bisect
+import math
+import re
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Prometheus/OpenMetrics instrumentation, served as text from a local HTTP endpoint
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+LOOP_LAG_INTERVAL = 0.5  # Seconds between event loop lag probes
+
+LabelValues = Tuple[str, ...]
+
+# IDs in endpoint paths are collapsed so each endpoint is one label value
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    # "/projects/123" -> "/projects/{id}"
+    return _ID_SEGMENT.sub("/{id}", endpoint)
+
+
+def format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    # Base class: one metric family with an optional set of labels
+    kind = "unknown"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        # (metric name with suffix, formatted labels, value)
+        return ()
+
+    def render(self) -> List[str]:
+        lines = [f"# TYPE {self.name} {self.kind}", f"# HELP {self.name} {self.help_text}"]
+        lines.extend(f"{name}{labels} {format_value(value)}" for name, labels, value in self.samples())
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = defaultdict(float)
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        self._values[label_values] += amount
+
+    def samples(self):
+        for values, value in sorted(self._values.items()):
+            yield f"{self.name}_total", format_labels(self.labels, values), value
+
+
+class Gauge(Metric):
+    # A value that is set directly, or read from a callback at scrape time
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Tuple[str, ...] = (),
+        callback: Optional[Callable[[], Any]] = None,
+    ):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {}
+        # Returns a number, or (label values, number) pairs for labelled gauges
+        self.callback = callback
+
+    def set(self, value: float, *label_values: str) -> None:
+        self._values[label_values] = value
+
+    def samples(self):
+        values = self._values
+        if self.callback is not None:
+            result = self.callback()
+            values = {(): result} if isinstance(result, (int, float)) else dict(result)
+        for label_values, value in sorted(values.items()):
+            yield self.name, format_labels(self.labels, label_values), value
+
+
+class CounterCallback(Gauge):
+    # Counter whose total is owned elsewhere (e.g. the response cache) and read at scrape time
+    kind = "counter"
+
+    def samples(self):
+        for name, labels, value in super().samples():
+            yield f"{name}_total", labels, value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Label values -> [per-bucket counts (last one is +Inf), sum]
+        self._values: Dict[LabelValues, List[Any]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        entry = self._values.get(label_values)
+        if entry is None:
+            entry = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    def samples(self):
+        for label_values, (counts, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{format_value(float(bound))}"'
+                yield f"{self.name}_bucket", format_labels(self.labels, label_values, le), cumulative
+            yield f"{self.name}_count", format_labels(self.labels, label_values), cumulative
+            yield f"{self.name}_sum", format_labels(self.labels, label_values), total
+
+
+class Registry:
+    # Every metric exposed by this process
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name: str) -> None:
+        self._metrics.pop(name, None)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+command_latency = registry.register(Histogram(
+    "flavortown_command_duration_seconds",
+    "Time from a slash command starting to its handler finishing",
+    ("command", "outcome"),
+))
+api_latency = registry.register(Histogram(
+    "flavortown_api_request_duration_seconds",
+    "Upstream API request latency per attempt",
+    ("method", "endpoint"),
+))
+api_responses = registry.register(Counter(
+    "flavortown_api_responses",
+    "Upstream API responses by status code (0 for network errors)",
+    ("method", "endpoint", "status"),
+))
+views_sent = registry.register(Counter("flavortown_views_sent", "Button rows sent, by kind", ("view",)))
+components_routed = registry.register(Counter(
+    "flavortown_components_routed", "Button clicks routed by custom_id", ("action",)
+))
+loop_lag = registry.register(Histogram(
+    "flavortown_event_loop_lag_seconds",
+    "How late a periodic event loop probe woke up",
+    buckets=LOOP_LAG_BUCKETS,
+))
+
+
+def track_view(name: str) -> None:
+    # Count a button row sent with a message
+    views_sent.inc(name)
+
+
+def track_component(action: str) -> None:
+    # Count a routed button click
+    components_routed.inc(action)
+
+
+def observe_api_request(method: str, endpoint: str, status: int, seconds: float) -> None:
+    # FlavorTownAPI request listener
+    endpoint = normalize_endpoint(endpoint)
+    api_latency.observe(seconds, method, endpoint)
+    api_responses.inc(method, endpoint, str(status))
+
+
+def register_api(api) -> None:
+    # Export the API client's cache and rate limiter state and listen to its requests
+    api.add_request_listener(observe_api_request)
+    registry.register(CounterCallback(
+        "flavortown_api_cache_hits", "Response cache hits", callback=lambda: api.cache.hits
+    ))
+    registry.register(CounterCallback(
+        "flavortown_api_cache_misses", "Response cache misses", callback=lambda: api.cache.misses
+    ))
+    registry.register(Gauge(
+        "flavortown_api_cache_hit_ratio",
+        "Share of cached lookups served from the cache",
+        callback=lambda: api.cache.hits / max(1, api.cache.hits + api.cache.misses),
+    ))
+    registry.register(Gauge(
+        "flavortown_api_cache_bytes", "Response bodies held in the cache", callback=lambda: api.cache.size_bytes
+    ))
+    registry.register(Gauge(
+        "flavortown_api_rate_limit_pending",
+        "Requests waiting for a rate limit token",
+        callback=lambda: api.rate_limiter.pending,
+    ))
+
+
+def register_gauge(name: str, help_text: str, callback: Callable[[], Any]) -> None:
+    registry.register(Gauge(name, help_text, callback=callback))
+
+
+async def measure_loop_lag(interval: float = LOOP_LAG_INTERVAL):
+    # Sleep for a fixed interval and record how late we wake up
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        loop_lag.observe(max(0.0, loop.time() - started - interval))
+
+
+class MetricsServer:
+    # Serves GET /metrics on a local port alongside the bot
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._runner = None  # aiohttp.web.AppRunner once started
+        self._lag_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        # aiohttp.web is only imported when metrics are actually served
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle_metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        self._lag_task = asyncio.create_task(measure_loop_lag())
+        print(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    async def close(self):
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            try:
+                await self._lag_task
+            except asyncio.CancelledError:
+                pass
+            self._lag_task = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def handle_metrics(self, request):
+        from aiohttp import web
+
+        return web.Response(body=registry.render().encode(), headers={"Content-Type": CONTENT_TYPE})
+
+
+def command_started(interaction) -> None:
+    # Mark the start of a slash command (called from the command tree's interaction check)
+    interaction.extras["started_at"] = time.perf_counter()
+
+
+def command_finished(interaction, outcome: str) -> None:
+    # Record a slash command's duration, if we saw it start
+    started_at = interaction.extras.get("started_at")
+    if started_at is None or interaction.command is None:
+        return
+    command_latency.observe(time.perf_counter() - started_at, interaction.command.qualified_name, outcome)
@@ -0,0 +1,180 @@
+import json
+import sys
+from typing import Any, Callable, ClassVar, Dict, FrozenSet, Iterator, Type
+
+try:
+    import orjson
+except ImportError:  # Optional: faster parsing and serialization (pip install orjson)
+    orjson = None
+
+# Compact, read-only models for API payloads. Each model keeps one slot per known field
+# instead of a per-record dict, shares repeated enum-like strings through sys.intern, and
+# still reads like the dict it came from (record["title"], record.get("stock", 0)), so
+# embeds, indexes and stores work with either. Fields the API adds later are kept in _extra.
+
+_MISSING = object()
+
+
+class Model:
+    __slots__ = ("_extra",)
+
+    NESTED: ClassVar[Dict[str, Type["Model"]]] = {}  # Field -> model for nested objects
+    INTERNED: ClassVar[FrozenSet[str]] = frozenset()  # Fields whose string values are interned
+    _fields: ClassVar[FrozenSet[str]] = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = frozenset(cls.__slots__)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Model":
+        self = cls.__new__(cls)
+        fields, interned, nested = cls._fields, cls.INTERNED, cls.NESTED
+        extra = None
+        for key, value in data.items():
+            if key not in fields:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+                continue
+            if key in interned:
+                if isinstance(value, str):
+                    value = sys.intern(value)
+            elif key in nested:
+                if isinstance(value, dict):
+                    value = nested[key].from_dict(value)
+            setattr(self, key, value)
+        self._extra = extra
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        # The payload this model was parsed from (field order aside)
+        result = {}
+        for key in self.__slots__:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                result[key] = value.to_dict() if isinstance(value, Model) else value
+        if self._extra:
+            result.update(self._extra)
+        return result
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._fields:
+            return getattr(self, key, default)
+        return self._extra.get(key, default) if self._extra else default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Model):
+            other = other.to_dict()
+        return isinstance(other, dict) and self.to_dict() == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class TicketCost(Model):
+    __slots__ = ("base_cost", "us", "eu", "uk", "ca", "au")
+
+
+class Enabled(Model):
+    __slots__ = ("enabled_us", "enabled_eu", "enabled_uk", "enabled_ca", "enabled_au")
+
+
+class Project(Model):
+    __slots__ = (
+        "id", "title", "description", "ship_status", "repo_url", "demo_url", "readme_url",
+        "ai_declaration", "devlog_ids", "created_at", "updated_at",
+    )
+    INTERNED = frozenset({"ship_status"})
+
+
+class User(Model):
+    __slots__ = (
+        "id", "display_name", "slack_id", "avatar", "project_ids", "vote_count", "like_count",
+        "cookies", "devlog_seconds_today", "devlog_seconds_total",
+    )
+
+
+class Devlog(Model):
+    __slots__ = (
+        "id", "project_id", "body", "comments_count", "likes_count", "duration_seconds",
+        "scrapbook_url", "media", "created_at", "updated_at",
+    )
+
+
+class StoreItem(Model):
+    __slots__ = (
+        "id", "name", "description", "long_description", "type", "stock", "limited", "max_qty",
+        "one_per_person_ever", "sale_percentage", "show_in_carousel", "image_url", "accessory_tag",
+        "agh_contents", "attached_shop_item_ids", "buyable_by_self", "old_prices", "ticket_cost", "enabled",
+    )
+    NESTED = {"ticket_cost": TicketCost, "enabled": Enabled}
+    INTERNED = frozenset({"type", "accessory_tag"})
+
+
+# Listing key -> model of its records
+LISTING_MODELS = {"projects": Project, "users": User, "devlogs": Devlog}
+
+
+def parse_record(model: Type[Model]) -> Callable[[Any], Any]:
+    # Parser for a single-record response
+    def parse(payload):
+        return model.from_dict(payload) if isinstance(payload, dict) else payload
+    return parse
+
+
+def parse_records(model: Type[Model]) -> Callable[[Any], Any]:
+    # Parser for a response that is a bare list of records
+    def parse(payload):
+        if not isinstance(payload, list):
+            return payload
+        return [model.from_dict(record) if isinstance(record, dict) else record for record in payload]
+    return parse
+
+
+def parse_listing(key: str) -> Callable[[Any], Any]:
+    # Parser for a paginated listing ({key: [...], "pagination": {...}})
+    parse_page = parse_records(LISTING_MODELS[key])
+
+    def parse(payload):
+        if isinstance(payload, dict) and key in payload:
+            payload[key] = parse_page(payload[key])
+        return payload
+    return parse
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Model):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def loads(body: bytes) -> Any:
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+def dumps(value: Any, sort_keys: bool = False) -> str:
+    # JSON text for payloads that may contain models
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_SORT_KEYS if sort_keys else 0).decode()
+    return json.dumps(value, default=_default, sort_keys=sort_keys)
+
+
+def dumps_bytes(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, default=_default).encode()
@@ -0,0 +1,112 @@
+import asyncio
+import heapq
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+MAX_PENDING = 2000  # Unsorted updates searched linearly before they are merged into the arrays
+MAX_WORDS = 12  # Words of a label kept in its full-label key
+MAX_KEY_WORDS = 3  # Only the first few words of a label start a key of their own
+
+
+def normalize(text: str) -> str:
+    return " ".join(re.findall(r"\w+", text.casefold()))
+
+
+class PrefixIndex:
+    # Sorted-array prefix index mapping names to IDs, for autocomplete without upstream calls
+
+    def __init__(self):
+        self._labels: Dict[int, str] = {}
+        # Parallel sorted arrays: normalized key -> entity ID (one key per label and per word)
+        self._keys: List[str] = []
+        self._ids: List[int] = []
+        # Labels changed since the last merge; searched linearly
+        self._pending: Dict[int, str] = {}
+        self._compaction: Optional[asyncio.Task] = None
+        self._merge_lock = asyncio.Lock()  # Merges must start from the previous merge's arrays
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def update(self, items: List[Tuple[int, str]]):
+        # Add or relabel entries given as (id, label) pairs
+        for item_id, label in items:
+            if label and self._labels.get(item_id) != label:
+                self._labels[item_id] = label
+                self._pending[item_id] = label
+        if len(self._pending) > MAX_PENDING and self._compaction is None:
+            self._compaction = asyncio.get_running_loop().create_task(self._compact_while_pending())
+
+    async def compact(self):
+        # Merge pending updates into the sorted arrays. The merge runs in a worker thread
+        # on copies, so the loop keeps serving searches (from the old arrays plus pending)
+        async with self._merge_lock:
+            if not self._pending:
+                return
+            pending = dict(self._pending)
+            keys, ids = await asyncio.get_running_loop().run_in_executor(
+                None, merge_keys, self._keys, self._ids, pending
+            )
+            self._keys, self._ids = keys, ids
+            for item_id, label in pending.items():
+                # Entries relabelled during the merge stay pending
+                if self._pending.get(item_id) == label:
+                    del self._pending[item_id]
+
+    async def _compact_while_pending(self):
+        try:
+            while len(self._pending) > MAX_PENDING:
+                await self.compact()
+        finally:
+            self._compaction = None
+
+    def search(self, text: str, limit: int = 25) -> List[Tuple[int, str]]:
+        # Return up to `limit` (id, label) pairs whose label or one of its words starts with `text`
+        text = text.strip()
+        results: Dict[int, str] = {}
+        if text.isdigit() and int(text) in self._labels:
+            results[int(text)] = self._labels[int(text)]
+
+        prefix = normalize(text)
+        if not prefix:
+            for item_id in list(self._labels)[:limit]:
+                results.setdefault(item_id, self._labels[item_id])
+            return list(results.items())[:limit]
+
+        for item_id, label in self._pending.items():
+            if len(results) >= limit:
+                break
+            if any(key.startswith(prefix) for key in keys_for(item_id, label)):
+                results.setdefault(item_id, label)
+
+        index = bisect_left(self._keys, prefix)
+        while index < len(self._keys) and len(results) < limit and self._keys[index].startswith(prefix):
+            item_id = self._ids[index]
+            # Skip stale keys for entries that were relabelled since the last merge
+            if item_id not in self._pending:
+                results.setdefault(item_id, self._labels[item_id])
+            index += 1
+        return list(results.items())[:limit]
+
+
+def keys_for(item_id: int, label: str) -> List[str]:
+    # The ID, the label, and the label from each of its first few words
+    words = normalize(label).split()[:MAX_WORDS]
+    keys = {str(item_id)}
+    for i in range(min(len(words), MAX_KEY_WORDS)):
+        keys.add(" ".join(words[i:]))
+    return list(keys)
+
+
+def merge_keys(keys: List[str], ids: List[int], pending: Dict[int, str]) -> Tuple[List[str], List[int]]:
+    # New sorted arrays: the old ones without keys of relabelled entries, merged with the
+    # sorted keys of the pending labels. Linear in the index size plus sorting the pending keys.
+    fresh = sorted((key, item_id) for item_id, label in pending.items() for key in keys_for(item_id, label))
+    kept = ((key, item_id) for key, item_id in zip(keys, ids) if item_id not in pending)
+    merged_keys: List[str] = []
+    merged_ids: List[int] = []
+    for key, item_id in heapq.merge(kept, fresh):
+        merged_keys.append(key)
+        merged_ids.append(item_id)
+    return merged_keys, merged_ids
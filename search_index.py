@@ -0,0 +1,140 @@
+import json
+import re
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import models
+
+PAGE_SIZE = 5  # Results per page, matching what the listing embeds show
+MAX_INDEX_AGE = 6 * 3600  # Seconds a complete index is trusted before falling back upstream
+
+# Entity kind -> (response key, title field, body field)
+KINDS = {
+    "project": ("projects", "title", "description"),
+    "user": ("users", "display_name", "slack_id"),
+    "devlog": ("devlogs", None, "body"),
+}
+
+
+def build_match_query(query: str) -> str:
+    # Turn free text into an FTS5 query that prefix-matches every word
+    tokens = re.findall(r"\w+", query.lower())
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+class SearchIndex:
+    # Local full-text index (SQLite FTS5) over projects, users and devlogs
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+
+    def open(self):
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                rowid INTEGER PRIMARY KEY,
+                kind TEXT NOT NULL,
+                id INTEGER NOT NULL,
+                indexed_at REAL NOT NULL,
+                payload TEXT NOT NULL,
+                UNIQUE (kind, id)
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+                title, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+            );
+            CREATE TABLE IF NOT EXISTS coverage (
+                kind TEXT PRIMARY KEY,
+                complete_at REAL NOT NULL
+            );
+            """
+        )
+        self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def add(self, kind: str, records: Iterable[Dict[str, Any]]) -> int:
+        # Insert or refresh records of one kind; returns how many were indexed
+        _, title_field, body_field = KINDS[kind]
+        now = time.time()
+        count = 0
+        for record in records:
+            if record.get("id") is None:
+                continue
+            title = (record.get(title_field) or "") if title_field else ""
+            body = record.get(body_field) or ""
+            payload = models.dumps(record)
+            row = self._db.execute(
+                "SELECT rowid FROM documents WHERE kind = ? AND id = ?", (kind, record["id"])
+            ).fetchone()
+            if row is None:
+                cursor = self._db.execute(
+                    "INSERT INTO documents (kind, id, indexed_at, payload) VALUES (?, ?, ?, ?)",
+                    (kind, record["id"], now, payload),
+                )
+                self._db.execute(
+                    "INSERT INTO documents_fts (rowid, title, body) VALUES (?, ?, ?)",
+                    (cursor.lastrowid, title, body),
+                )
+            else:
+                self._db.execute(
+                    "UPDATE documents SET indexed_at = ?, payload = ? WHERE rowid = ?", (now, payload, row[0])
+                )
+                self._db.execute(
+                    "UPDATE documents_fts SET title = ?, body = ? WHERE rowid = ?", (title, body, row[0])
+                )
+            count += 1
+        self._db.commit()
+        return count
+
+    def mark_complete(self, kind: str, at: Optional[float] = None):
+        # Record that every record of a kind has been indexed (called after a full crawl)
+        self._db.execute(
+            "INSERT OR REPLACE INTO coverage (kind, complete_at) VALUES (?, ?)", (kind, at or time.time())
+        )
+        self._db.commit()
+
+    def freshness(self, kind: str) -> Tuple[int, Optional[float]]:
+        # Number of indexed records and when the kind was last fully indexed
+        count = self._db.execute("SELECT COUNT(*) FROM documents WHERE kind = ?", (kind,)).fetchone()[0]
+        row = self._db.execute("SELECT complete_at FROM coverage WHERE kind = ?", (kind,)).fetchone()
+        return count, row[0] if row else None
+
+    def is_fresh(self, kind: str, max_age: float = MAX_INDEX_AGE) -> bool:
+        # True when the index can answer searches for a kind on its own
+        if self._db is None:
+            return False
+        _, complete_at = self.freshness(kind)
+        return complete_at is not None and time.time() - complete_at <= max_age
+
+    def search(self, kind: str, query: str, page: int = 1, per_page: int = PAGE_SIZE) -> Dict[str, Any]:
+        # Ranked search shaped like an API listing response ({<kind>s: [...], pagination: {...}})
+        key = KINDS[kind][0]
+        match = build_match_query(query)
+        if not match:
+            return {key: [], "pagination": {"current_page": 1, "total_pages": 1, "total_count": 0}}
+
+        total = self._db.execute(
+            "SELECT COUNT(*) FROM documents_fts JOIN documents d ON d.rowid = documents_fts.rowid "
+            "WHERE documents_fts MATCH ? AND d.kind = ?",
+            (match, kind),
+        ).fetchone()[0]
+        total_pages = max(1, (total + per_page - 1) // per_page)
+        page = min(max(1, page), total_pages)
+        rows = self._db.execute(
+            "SELECT d.payload FROM documents_fts JOIN documents d ON d.rowid = documents_fts.rowid "
+            "WHERE documents_fts MATCH ? AND d.kind = ? "
+            "ORDER BY bm25(documents_fts, 10.0, 1.0), d.id DESC LIMIT ? OFFSET ?",
+            (match, kind, per_page, (page - 1) * per_page),
+        ).fetchall()
+        return {
+            key: [json.loads(row[0]) for row in rows],
+            "pagination": {"current_page": page, "total_pages": total_pages, "total_count": total},
+        }
@@ -0,0 +1,102 @@
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import discord
+
+RATE_WINDOW = 60  # Seconds over which event rates are measured
+BUCKET_SECONDS = 5
+
+# Gateway lifecycle events and the counter they bump
+LIFECYCLE_EVENTS = {
+    "shard_connect": "connects",
+    "shard_disconnect": "disconnects",
+    "shard_resumed": "resumes",
+    "connect": "connects",
+    "disconnect": "disconnects",
+    "resumed": "resumes",
+}
+
+
+def parse_shard_ids(value: Optional[str]) -> Optional[List[int]]:
+    # Parse "0,1,4-7" into [0, 1, 4, 5, 6, 7]
+    if not value:
+        return None
+    shard_ids = []
+    for part in value.split(","):
+        part = part.strip()
+        if "-" in part:
+            start, end = part.split("-", 1)
+            shard_ids.extend(range(int(start), int(end) + 1))
+        elif part:
+            shard_ids.append(int(part))
+    return sorted(set(shard_ids))
+
+
+def shard_of(args: Tuple[Any, ...]) -> Optional[int]:
+    # Best-effort shard ID for a dispatched event's arguments
+    for arg in args:
+        guild = arg if isinstance(arg, discord.Guild) else getattr(arg, "guild", None)
+        if isinstance(guild, discord.Guild):
+            return guild.shard_id
+    return None
+
+
+class ShardMetrics:
+    # Per-shard gateway latency, event rates and connection counters
+
+    def __init__(self, bot: discord.Client):
+        self.bot = bot
+        self.events: Dict[Optional[int], int] = defaultdict(int)
+        self.counters: Dict[Optional[int], Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        # Shard -> deque of [bucket start, count] covering the last RATE_WINDOW seconds
+        self._buckets: Dict[Optional[int], Deque[List[float]]] = defaultdict(deque)
+
+    def record_event(self, event_name: str, args: Tuple[Any, ...]):
+        # Called from Bot.dispatch for every event; keep it cheap
+        counter = LIFECYCLE_EVENTS.get(event_name)
+        if counter is not None:
+            shard_id = args[0] if args and isinstance(args[0], int) else 0
+            self.counters[shard_id][counter] += 1
+            return
+
+        shard_id = shard_of(args)
+        if shard_id is None and self.bot.shard_count in (None, 1):
+            shard_id = 0
+        self.events[shard_id] += 1
+        now = time.monotonic()
+        buckets = self._buckets[shard_id]
+        if buckets and now - buckets[-1][0] < BUCKET_SECONDS:
+            buckets[-1][1] += 1
+        else:
+            buckets.append([now, 1])
+            while buckets and now - buckets[0][0] > RATE_WINDOW:
+                buckets.popleft()
+
+    def event_rate(self, shard_id: Optional[int]) -> float:
+        # Events per second over the last RATE_WINDOW seconds
+        now = time.monotonic()
+        total = sum(count for start, count in self._buckets.get(shard_id, ()) if now - start <= RATE_WINDOW)
+        return total / RATE_WINDOW
+
+    def latencies(self) -> List[Tuple[int, float]]:
+        # (shard_id, seconds) for every shard in this process
+        if hasattr(self.bot, "latencies"):
+            return list(self.bot.latencies)
+        return [(self.bot.shard_id or 0, self.bot.latency)]
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        # One row per shard in this process
+        rows = []
+        for shard_id, latency in self.latencies():
+            counters = self.counters.get(shard_id, {})
+            rows.append({
+                "shard_id": shard_id,
+                "latency": latency,
+                "events": self.events.get(shard_id, 0),
+                "event_rate": self.event_rate(shard_id),
+                "connects": counters.get("connects", 0),
+                "disconnects": counters.get("disconnects", 0),
+                "resumes": counters.get("resumes", 0),
+            })
+        return rows
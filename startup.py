@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+from discord import app_commands
+
+import models
+from datastore import DataStore
+from flavortown_api import ResponseCache, parse_response
+from store_catalog import StoreCatalog
+
+# Startup pipeline: sync application commands only when they changed, and carry the
+# API response cache and store catalog across restarts in a snapshot file
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_MAX_AGE = 3600  # Seconds after which a snapshot is too old to restore
+
+
+def command_tree_hash(tree: app_commands.CommandTree) -> str:
+    # Stable hash of every global command payload we would send to Discord
+    payloads = sorted((command.to_dict() for command in tree.get_commands()), key=lambda p: (p.get("type", 1), p["name"]))
+    return hashlib.sha256(json.dumps(payloads, sort_keys=True).encode()).hexdigest()
+
+
+async def sync_commands(tree: app_commands.CommandTree, store: DataStore, application_id: int, force: bool = False) -> bool:
+    # Sync the command tree if it differs from the last one synced for this application;
+    # returns True if a sync was sent
+    key = f"command_hash:{application_id}"
+    digest = command_tree_hash(tree)
+    if not force and store.get_meta(key) == digest:
+        print("Commands unchanged, skipping sync")
+        return False
+    try:
+        synced = await tree.sync()
+    except Exception as e:
+        print(f"Failed to sync commands: {e}")
+        return False
+    store.set_meta(key, digest)
+    print(f"Synced {len(synced)} command(s)")
+    return True
+
+
+def save_snapshot(path: str, cache: ResponseCache, catalog: StoreCatalog) -> None:
+    # Write the cache and catalog atomically so a crash mid-write leaves the old snapshot
+    snapshot: Dict[str, Any] = {"version": SNAPSHOT_VERSION, "saved_at": time.time(), "cache": cache.dump()}
+    if catalog.snapshot is not None:
+        snapshot["store"] = {"items": catalog.snapshot.items, "fetched_at": catalog.snapshot.fetched_at}
+    temp_path = f"{path}.tmp"
+    try:
+        with open(temp_path, "w") as f:
+            f.write(models.dumps(snapshot))
+        os.replace(temp_path, path)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"Failed to save snapshot: {e}")
+
+
+def load_snapshot(path: str, cache: ResponseCache, catalog: StoreCatalog) -> Optional[float]:
+    # Restore a recent snapshot; returns its age in seconds, or None if nothing was restored
+    try:
+        with open(path) as f:
+            snapshot = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable snapshot: {e}")
+        return None
+    age = time.time() - snapshot.get("saved_at", 0)
+    if snapshot.get("version") != SNAPSHOT_VERSION or not 0 <= age <= SNAPSHOT_MAX_AGE:
+        return None
+    entries = cache.load(snapshot.get("cache", []), age, parse=parse_response)
+    store = snapshot.get("store")
+    if store is not None:
+        catalog.restore(parse_response("/store", store["items"]), store["fetched_at"])
+    print(f"Restored {entries} cached response(s){' and the store catalog' if store else ''} from a {age:.0f}s old snapshot")
+    return age
@@ -0,0 +1,121 @@
+import asyncio
+import hashlib
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import discord
+
+import models
+from embeds import store_page_embed
+from flavortown_api import FlavorTownAPI, background_priority
+
+STORE_REFRESH_INTERVAL = 300  # Seconds between catalog refreshes
+ITEMS_PER_PAGE = 5
+
+
+def content_hash(items: List[Dict[str, Any]]) -> str:
+    # Stable hash of the catalog contents, used to detect real changes
+    return hashlib.sha256(models.dumps(items, sort_keys=True).encode()).hexdigest()
+
+
+def base_cost(item: Dict[str, Any]) -> float:
+    cost = (item.get("ticket_cost") or {}).get("base_cost")
+    return cost if cost is not None else float("inf")
+
+
+class CatalogSnapshot:
+    # The store at one point in time: grouped, sorted and with every page embed pre-rendered
+
+    def __init__(self, items: List[Dict[str, Any]], digest: str):
+        self.items = items
+        self.hash = digest
+        self.fetched_at = time.time()
+        self.items_by_id = {item["id"]: item for item in items}
+
+        # Group items by type and sort by base cost (ascending)
+        self.items_by_type: Dict[str, List[Dict[str, Any]]] = {}
+        for item in items:
+            self.items_by_type.setdefault(item.get("type") or "Other", []).append(item)
+        for type_items in self.items_by_type.values():
+            type_items.sort(key=base_cost)
+
+        # Flat list of pages across all categories, in display order
+        self.pages: List[discord.Embed] = []
+        types = list(self.items_by_type)
+        for category, item_type in enumerate(types):
+            type_items = self.items_by_type[item_type]
+            for item_page in range((len(type_items) - 1) // ITEMS_PER_PAGE + 1):
+                self.pages.append(
+                    store_page_embed(item_type, type_items, item_page, category, len(types), ITEMS_PER_PAGE)
+                )
+
+
+class StoreCatalog:
+    # Keeps a precomputed store snapshot in memory and refreshes it on a schedule
+
+    def __init__(self, api: FlavorTownAPI, refresh_interval: float = STORE_REFRESH_INTERVAL):
+        self.api = api
+        self.refresh_interval = refresh_interval
+        self.snapshot: Optional[CatalogSnapshot] = None
+        self._listeners: List[Callable[[Optional[CatalogSnapshot], CatalogSnapshot], Any]] = []
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def add_listener(self, listener: Callable[[Optional[CatalogSnapshot], CatalogSnapshot], Any]):
+        # Call listener(previous, current) whenever the catalog contents change
+        self._listeners.append(listener)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def restore(self, items: List[Dict[str, Any]], fetched_at: float):
+        # Start from a catalog saved by a previous run; the next refresh replaces it
+        self.snapshot = CatalogSnapshot(items, content_hash(items))
+        self.snapshot.fetched_at = fetched_at
+        self._notify(None, self.snapshot)
+
+    async def get_snapshot(self) -> CatalogSnapshot:
+        # Current snapshot, fetching the catalog on first use
+        if self.snapshot is None:
+            await self.refresh()
+        return self.snapshot
+
+    async def refresh(self) -> bool:
+        # Fetch the catalog; returns True if its contents changed
+        async with self._lock:
+            items = await self.api.get_store_items(use_cache=False)
+            digest = content_hash(items)
+            if self.snapshot is not None and self.snapshot.hash == digest:
+                self.snapshot.fetched_at = time.time()
+                return False
+            previous, self.snapshot = self.snapshot, CatalogSnapshot(items, digest)
+        self._notify(previous, self.snapshot)
+        return True
+
+    def _notify(self, previous: Optional[CatalogSnapshot], current: CatalogSnapshot):
+        # One failing listener must not keep the others from seeing the change
+        for listener in self._listeners:
+            try:
+                listener(previous, current)
+            except Exception as e:
+                print(f"Store catalog listener failed: {type(e).__name__}: {e}")
+
+    async def _run(self):
+        with background_priority():
+            while True:
+                try:
+                    await self.refresh()
+                except ValueError as e:
+                    print(f"Store catalog refresh failed: {e}")
+                except Exception as e:
+                    print(f"Store catalog refresh failed unexpectedly: {type(e).__name__}: {e}")
+                await asyncio.sleep(self.refresh_interval)
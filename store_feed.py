@@ -0,0 +1,171 @@
+import asyncio
+import sqlite3
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import discord
+
+from embeds import MAX_MESSAGE_EMBED_CHARS, batch_embeds, format_price_with_hours
+from store_catalog import CatalogSnapshot
+
+MAX_SUBSCRIPTIONS = 25  # Per channel or user
+MAX_FIELDS = 25  # Discord's limit on fields per embed
+
+REGIONS = {
+    "enabled_us": "🇺🇸 US",
+    "enabled_eu": "🇪🇺 EU",
+    "enabled_uk": "🇬🇧 UK",
+    "enabled_ca": "🇨🇦 CA",
+    "enabled_au": "🇦🇺 AU",
+}
+PRICE_KEYS = {"base_cost": "Base", "us": "US", "eu": "EU", "uk": "UK", "ca": "CA"}
+
+
+def describe_changes(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    # Human readable stock, availability and price changes between two versions of an item
+    changes = []
+    if old.get("stock") != new.get("stock"):
+        restock = " (restock!)" if not old.get("stock") and new.get("stock") else ""
+        changes.append(f"Stock: {old.get('stock', 'Unknown')} → {new.get('stock', 'Unknown')}{restock}")
+
+    old_enabled = old.get("enabled") or {}
+    new_enabled = new.get("enabled") or {}
+    added = [name for key, name in REGIONS.items() if new_enabled.get(key) and not old_enabled.get(key)]
+    removed = [name for key, name in REGIONS.items() if old_enabled.get(key) and not new_enabled.get(key)]
+    if added:
+        changes.append(f"Now available in {', '.join(added)}")
+    if removed:
+        changes.append(f"No longer available in {', '.join(removed)}")
+
+    old_cost = old.get("ticket_cost") or {}
+    new_cost = new.get("ticket_cost") or {}
+    for key, name in PRICE_KEYS.items():
+        if old_cost.get(key) != new_cost.get(key):
+            changes.append(
+                f"{name} price: {format_price_with_hours(old_cost.get(key))} → {format_price_with_hours(new_cost.get(key))}"
+            )
+    return changes
+
+
+def diff_catalogs(previous: CatalogSnapshot, current: CatalogSnapshot) -> List[Tuple[Dict[str, Any], List[str]]]:
+    # (item, changes) for every new, removed or changed item
+    diffs = []
+    for item_id, item in current.items_by_id.items():
+        old = previous.items_by_id.get(item_id)
+        if old is None:
+            diffs.append((item, ["New in the store"]))
+            continue
+        changes = describe_changes(old, item)
+        if changes:
+            diffs.append((item, changes))
+    for item_id, item in previous.items_by_id.items():
+        if item_id not in current.items_by_id:
+            diffs.append((item, ["Removed from the store"]))
+    return diffs
+
+
+def update_embeds(entries: List[Tuple[Dict[str, Any], List[str]]]) -> List[discord.Embed]:
+    # One field per changed item, starting a new embed whenever the field or size limit is reached
+    embed_list = [discord.Embed(title="🛍️ Store Update", color=discord.Color.gold())]
+    for item, changes in entries:
+        name = f"{item['name']} (ID: {item['id']})"[:256]
+        value = "\n".join(changes)[:1024]
+        embed = embed_list[-1]
+        if len(embed.fields) == MAX_FIELDS or len(embed) + len(name) + len(value) > MAX_MESSAGE_EMBED_CHARS:
+            embed = discord.Embed(color=discord.Color.gold())
+            embed_list.append(embed)
+        embed.add_field(name=name, value=value, inline=False)
+    return embed_list
+
+
+class StoreFeed:
+    # Store change subscriptions, notified with batched messages per channel or user
+
+    def __init__(self, bot: discord.Client, path: str):
+        self.bot = bot
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+
+    def open(self):
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS store_subscriptions ("
+            "target_type TEXT NOT NULL, target_id INTEGER NOT NULL, scope TEXT NOT NULL, value TEXT NOT NULL, "
+            "PRIMARY KEY (target_type, target_id, scope, value))"
+        )
+        self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def subscribe(self, target_type: str, target_id: int, scope: str, value: str) -> bool:
+        # Add a subscription; returns False if the target already has too many
+        if len(self.subscriptions(target_type, target_id)) >= MAX_SUBSCRIPTIONS:
+            return False
+        self._db.execute(
+            "INSERT OR IGNORE INTO store_subscriptions (target_type, target_id, scope, value) VALUES (?, ?, ?, ?)",
+            (target_type, target_id, scope, value.lower()),
+        )
+        self._db.commit()
+        return True
+
+    def unsubscribe(self, target_type: str, target_id: int, scope: str, value: str) -> bool:
+        cursor = self._db.execute(
+            "DELETE FROM store_subscriptions WHERE target_type = ? AND target_id = ? AND scope = ? AND value = ?",
+            (target_type, target_id, scope, value.lower()),
+        )
+        self._db.commit()
+        return cursor.rowcount > 0
+
+    def subscriptions(self, target_type: str, target_id: int) -> List[Tuple[str, str]]:
+        return self._db.execute(
+            "SELECT scope, value FROM store_subscriptions WHERE target_type = ? AND target_id = ? ORDER BY scope, value",
+            (target_type, target_id),
+        ).fetchall()
+
+    def on_catalog_change(self, previous: Optional[CatalogSnapshot], current: CatalogSnapshot):
+        # Catalog listener: diff the snapshots and notify subscribers in the background
+        if previous is None or self._db is None:
+            return
+        diffs = diff_catalogs(previous, current)
+        if diffs:
+            asyncio.create_task(self.notify(diffs))
+
+    async def notify(self, diffs: List[Tuple[Dict[str, Any], List[str]]]):
+        # Send each subscriber every change they follow, split into as few messages as fit
+        by_item: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
+        by_type: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
+        for target_type, target_id, scope, value in self._db.execute(
+            "SELECT target_type, target_id, scope, value FROM store_subscriptions"
+        ):
+            (by_item if scope == "item" else by_type)[value].append((target_type, target_id))
+
+        batches: Dict[Tuple[str, int], List[Tuple[Dict[str, Any], List[str]]]] = defaultdict(list)
+        for item, changes in diffs:
+            targets = set(by_item.get(str(item["id"]), [])) | set(by_type.get((item.get("type") or "other").lower(), []))
+            for target in targets:
+                batches[target].append((item, changes))
+
+        for (target_type, target_id), entries in batches.items():
+            try:
+                for batch in batch_embeds(update_embeds(entries)):
+                    await self._send(target_type, target_id, batch)
+            except discord.NotFound:
+                # Channel or user is gone; drop their subscriptions
+                self._db.execute(
+                    "DELETE FROM store_subscriptions WHERE target_type = ? AND target_id = ?",
+                    (target_type, target_id),
+                )
+                self._db.commit()
+            except discord.HTTPException as e:
+                print(f"Error sending store update to {target_type} {target_id}: {e}")
+
+    async def _send(self, target_type: str, target_id: int, embed_list: List[discord.Embed]):
+        if target_type == "user":
+            user = self.bot.get_user(target_id) or await self.bot.fetch_user(target_id)
+            await user.send(embeds=embed_list)
+        else:
+            await self.bot.get_partial_messageable(target_id).send(embeds=embed_list)
@@ -0,0 +1,131 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from datastore import DataStore
+from flavortown_api import FlavorTownAPI, background_priority
+
+SYNC_CONCURRENCY = 3  # Listing pages fetched ahead during a full sync
+INCREMENTAL_INTERVAL = 300  # Seconds between incremental passes
+FULL_SYNC_INTERVAL = 3 * 3600  # Seconds between full passes (corrects edits and deletions)
+MAX_INCREMENTAL_PAGES = 20  # Pages an incremental pass may walk before giving up
+
+# Paginated kinds -> response key
+PAGINATED_KINDS = {
+    "project": "projects",
+    "user": "users",
+    "devlog": "devlogs",
+}
+
+Listener = Callable[[str, List[Dict[str, Any]]], Any]
+
+
+class SyncEngine:
+    # Background crawler keeping a local copy of projects, users and devlogs
+
+    def __init__(self, api: FlavorTownAPI, store: DataStore):
+        self.api = api
+        self.store = store
+        self._listeners: List[Listener] = []
+        self._complete_listeners: List[Callable[[str], Any]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def add_listener(self, listener: Listener):
+        # Call listener(kind, records) for every batch of records that lands in the store
+        self._listeners.append(listener)
+
+    def add_complete_listener(self, listener: Callable[[str], Any]):
+        # Call listener(kind) whenever a full pass over a kind finishes
+        self._complete_listeners.append(listener)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        with background_priority():
+            while True:
+                for kind in PAGINATED_KINDS:
+                    try:
+                        checkpoint = self.store.get_checkpoint(kind)
+                        complete_at = checkpoint["full_complete_at"]
+                        if complete_at is None or time.time() - complete_at >= FULL_SYNC_INTERVAL:
+                            await self.full_sync(kind)
+                        else:
+                            await self.incremental_sync(kind)
+                    except ValueError as e:
+                        print(f"Sync of {kind}s failed: {e}")
+                    except Exception as e:
+                        # Keep syncing the other kinds (and this one next round) after local errors
+                        print(f"Sync of {kind}s failed unexpectedly: {type(e).__name__}: {e}")
+                await asyncio.sleep(INCREMENTAL_INTERVAL)
+
+    async def _fetch_page(self, kind: str, page: int) -> Dict[str, Any]:
+        if kind == "project":
+            return await self.api.get_projects(page=page)
+        if kind == "user":
+            return await self.api.get_users(page=page)
+        return await self.api.get_devlogs(page=page)
+
+    def _save(self, kind: str, records: List[Dict[str, Any]]):
+        self.store.upsert(kind, records)
+        for listener in self._listeners:
+            listener(kind, records)
+
+    async def _walk(self, kind: str, start_page: int) -> int:
+        # Store every page from start_page on, checkpointing as we go; returns pages walked
+        key = PAGINATED_KINDS[kind]
+        walked = 0
+        async for page, result in self.api.iter_pages(key, start_page=start_page, read_ahead=SYNC_CONCURRENCY):
+            self._save(kind, result.get(key, []))
+            self.store.set_checkpoint(kind, next_page=page + 1)
+            walked += 1
+        return walked
+
+    async def full_sync(self, kind: str):
+        # Walk every page of a kind with read-ahead, resuming from the last checkpoint
+        key = PAGINATED_KINDS[kind]
+        start_page = self.store.get_checkpoint(kind)["next_page"]
+        if not await self._walk(kind, start_page) and start_page > 1:
+            # The dataset shrank since the checkpoint was written; start over
+            await self._walk(kind, 1)
+        self.store.set_checkpoint(
+            kind, next_page=1, max_id=self.store.max_id(kind), full_complete_at=time.time()
+        )
+        for listener in self._complete_listeners:
+            listener(kind)
+        print(f"Synced {self.store.count(kind)} {key}")
+
+    async def incremental_sync(self, kind: str):
+        # Fetch only records newer than the highest stored ID
+        key = PAGINATED_KINDS[kind]
+        max_id = self.store.get_checkpoint(kind)["max_id"]
+        first = await self._fetch_page(kind, 1)
+        total_pages = first.get("pagination", {}).get("total_pages", 1)
+        records = first.get(key, [])
+        # Listings may be newest-first or oldest-first; walk from whichever end has new records
+        newest_first = len(records) < 2 or records[0]["id"] >= records[-1]["id"]
+        pages = range(1, total_pages + 1) if newest_first else range(total_pages, 0, -1)
+
+        newest = max_id
+        for count, page in enumerate(pages):
+            if count >= MAX_INCREMENTAL_PAGES:
+                break
+            result = first if page == 1 else await self._fetch_page(kind, page)
+            records = result.get(key, [])
+            fresh = [record for record in records if record["id"] > max_id]
+            if fresh:
+                self._save(kind, fresh)
+                newest = max(newest, max(record["id"] for record in fresh))
+            if len(fresh) < len(records):
+                break
+        if newest > max_id:
+            self.store.set_checkpoint(kind, max_id=newest)